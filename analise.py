@@ -0,0 +1,421 @@
+import heapq
+import math
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from tarefas import calcular_mmc_lista
+from escalonadores import gerar_instancias, escalonamento_eventos, perdas_de_deadline
+
+# Testes analíticos de escalonabilidade: dão o veredito exato sem simular o
+# hiperperíodo, então continuam rápidos mesmo quando o MMC dos períodos é enorme.
+
+def resposta_nivel(c, periodo, deadline, periodos, custos, inicio=0):
+    # Pior tempo de resposta sob prioridade fixa (análise de tempo de resposta) de
+    # uma tarefa (c, periodo, deadline) sob as mais prioritárias, dadas pelos
+    # arrays 'periodos' e 'custos': iteração de ponto fixo
+    # w = (q+1)*C + sum(ceil(w/Tj)*Cj) para cada instância q do período ocupado
+    # de nível i (cobre também D > T). 'inicio' é um limite inferior já conhecido
+    # do w da primeira instância, de onde a iteração pode partir.
+    # Se a iteração passar do deadline, para e devolve o valor que passou.
+    if c <= 0:
+        return 0
+    carga = int(custos.sum())
+    pior = 0
+    q = 0
+    while True:
+        w = (q + 1) * c + carga
+        if q == 0:
+            w = max(w, inicio)
+        while True:
+            novo = (q + 1) * c + int(np.dot(-(-w // periodos), custos))
+            if novo == w:
+                break
+            w = novo
+            if w - q * periodo > deadline:
+                return w - q * periodo
+        pior = max(pior, w - q * periodo)
+        if pior > deadline:
+            return pior
+        # A instância q termina antes da próxima liberação: fim do período ocupado
+        if w <= (q + 1) * periodo:
+            return pior
+        q += 1
+
+def tempo_resposta(tarefa, mais_prioritarias, inicio=0):
+    periodos = np.array([h.periodo for h in mais_prioritarias], dtype=np.int64)
+    custos = np.array([h.tempo_computacao for h in mais_prioritarias], dtype=np.int64)
+    return resposta_nivel(tarefa.tempo_computacao, tarefa.periodo, tarefa.deadline, periodos, custos, inicio)
+
+class NiveisPrioridade:
+    # As tarefas em ordem de prioridade, com período, deadline e C em arrays: a
+    # RTA de um nível soma a interferência das de cima numa operação só. Quem
+    # busca (sensibilidade.py) muda os arrays direto entre um teste e outro.
+    def __init__(self, tarefas):
+        self.ordenadas = sorted(tarefas, key=lambda x: x.prioridade)
+        self.periodos = np.array([x.periodo for x in self.ordenadas], dtype=np.int64)
+        self.deadlines = np.array([x.deadline for x in self.ordenadas], dtype=np.int64)
+        self.custos = np.array([x.tempo_computacao for x in self.ordenadas], dtype=np.int64)
+
+    def tempo_resposta(self, j, inicio=0):
+        return resposta_nivel(int(self.custos[j]), int(self.periodos[j]), int(self.deadlines[j]),
+                              self.periodos[:j], self.custos[:j], inicio)
+
+    def com(self, pos, tarefa):
+        # Estes níveis com 'tarefa' no nível pos, sem reordenar os demais
+        niveis = NiveisPrioridade([])
+        niveis.ordenadas = self.ordenadas[:pos] + [tarefa] + self.ordenadas[pos:]
+        for nome, valor in (('periodos', tarefa.periodo), ('deadlines', tarefa.deadline),
+                            ('custos', tarefa.tempo_computacao)):
+            array = getattr(self, nome)
+            setattr(niveis, nome, np.concatenate((array[:pos], [valor], array[pos:])))
+        return niveis
+
+    def cabe(self, j, inicio=0):
+        # O nível j cumpre o deadline. Com D <= T, basta a carga até o deadline
+        # caber nele (uma soma só); senão, a RTA partindo de 'inicio'
+        deadline = int(self.deadlines[j])
+        if deadline <= self.periodos[j]:
+            carga = int(self.custos[j]) + int(np.dot(-(-deadline // self.periodos[:j]), self.custos[:j]))
+            if carga <= deadline:
+                return True
+        return self.tempo_resposta(j, inicio) <= deadline
+
+def analise_tempo_resposta(tarefas):
+    # RTA para DM/RM/OPA: usa a prioridade atribuída por atribuir_prioridades_dm/rm/opa
+    # (1 = mais alta). Devolve um veredito por tarefa, na ordem de 'tarefas'.
+    niveis = NiveisPrioridade(tarefas)
+    resultado = {}
+    for j, t in enumerate(niveis.ordenadas):
+        r = niveis.tempo_resposta(j)
+        resultado[id(t)] = {
+            'nome': t.nome,
+            'tempo_resposta': r,
+            'deadline': t.deadline,
+            'escalonavel': r <= t.deadline
+        }
+    return [resultado[id(t)] for t in tarefas]
+
+def atribuir_prioridades_opa(tarefas):
+    # Atribuição ótima de prioridades de Audsley (OPA): do nível mais baixo para o
+    # mais alto, põe em cada nível uma tarefa que cumpre o deadline com todas as
+    # ainda sem nível acima dela. A RTA só depende de quais tarefas são mais
+    # prioritárias (não da ordem entre elas), então se alguma ordem fixa serve,
+    # esta acha uma; são no máximo n(n+1)/2 RTAs em vez de n! ordens.
+    # Devolve True se achou uma ordem viável. Se num nível nenhuma tarefa cabe,
+    # não há ordem viável: os níveis que faltam ficam em ordem de deadline (DM).
+    restantes = sorted(tarefas, key=lambda x: x.deadline)
+    viavel = True
+    for nivel in range(len(tarefas), 0, -1):
+        # Tenta primeiro os deadlines maiores: quando DM serve, sai a ordem DM
+        escolhida = None
+        for i in range(len(restantes) - 1, -1, -1):
+            t = restantes[i]
+            if tempo_resposta(t, restantes[:i] + restantes[i + 1:]) <= t.deadline:
+                escolhida = i
+                break
+        if escolhida is None:
+            viavel = False
+            break
+        restantes.pop(escolhida).prioridade = nivel
+    for i, t in enumerate(restantes):
+        t.prioridade = i + 1
+    return viavel
+
+def demanda_processador(tarefas, t):
+    # h(t): soma dos Ci das instâncias liberadas e com deadline em [0, t].
+    # Só divisão inteira: com U perto de 1, t passa da precisão de um float.
+    return sum(max(0, (t - x.deadline) // x.periodo + 1) * x.tempo_computacao for x in tarefas)
+
+def maior_deadline_antes(tarefas, t):
+    # Maior deadline absoluto d = k*Ti + Di com d < t (None se não houver)
+    maior = None
+    for x in tarefas:
+        if x.deadline < t:
+            k = -(-(t - x.deadline) // x.periodo) - 1
+            d = k * x.periodo + x.deadline
+            if maior is None or d > maior:
+                maior = d
+    return maior
+
+def periodo_ocupado_sincrono(tarefas):
+    # Tamanho do primeiro período ocupado com todas as tarefas liberadas em 0:
+    # ponto fixo de w = sum(ceil(w/Ti)*Ci). Só termina se U <= 1.
+    w = sum(t.tempo_computacao for t in tarefas)
+    while True:
+        novo = sum(-(-w // t.periodo) * t.tempo_computacao for t in tarefas)
+        if novo == w:
+            return w
+        w = novo
+
+def limite_demanda_edf(tarefas):
+    # Até onde o critério de demanda precisa ser verificado (U <= 1):
+    # L = min(La, Lb), com La o limite de Zhang & Burns e Lb o período ocupado síncrono
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    lb = periodo_ocupado_sincrono(tarefas)
+    if U == 1:
+        return lb
+    la = max(max(t.deadline for t in tarefas),
+             sum((t.periodo - t.deadline) * Fraction(t.tempo_computacao, t.periodo) for t in tarefas) / (1 - U))
+    return min(math.ceil(la), lb)
+
+def menor_intervalo_falha(tarefas, ate):
+    # Percorre os deadlines absolutos em ordem crescente até 'ate'
+    proximos = [(t.deadline, i) for i, t in enumerate(tarefas)]
+    heapq.heapify(proximos)
+    while proximos:
+        d, i = heapq.heappop(proximos)
+        if demanda_processador(tarefas, d) > d:
+            return d
+        if d + tarefas[i].periodo <= ate:
+            heapq.heappush(proximos, (d + tarefas[i].periodo, i))
+    return ate
+
+def soma_exata(fracoes):
+    # Soma de pares (numerador, denominador) sem simplificar a cada parcela:
+    # a Fraction só reduz no fim, bem mais rápido que somar Fractions
+    numerador, denominador = 0, 1
+    for n, d in fracoes:
+        numerador, denominador = numerador * d + n * denominador, denominador * d
+    return Fraction(numerador, denominador)
+
+class DemandaEDF:
+    # h(t) e a descida do QPA sobre arrays de período, deadline e C. Quem busca
+    # (sensibilidade.py) muda os arrays direto entre um teste e outro; com
+    # 'variavel', só essa posição muda, e as somas das demais para U e La ficam
+    # prontas. 'tipo' object troca o int64 por inteiros do Python, para t perto
+    # de 2^63.
+    def __init__(self, tarefas, variavel=None, tipo=np.int64):
+        self.variavel = variavel
+        self.periodos = np.array([t.periodo for t in tarefas], dtype=tipo)
+        self.deadlines = np.array([t.deadline for t in tarefas], dtype=tipo)
+        self.custos = np.array([t.tempo_computacao for t in tarefas], dtype=tipo)
+        if variavel is not None:
+            outras = [t for k, t in enumerate(tarefas) if k != variavel]
+            self.utilizacao_outras = soma_exata((t.tempo_computacao, t.periodo) for t in outras)
+            self.soma_outras = soma_exata(((t.periodo - t.deadline) * t.tempo_computacao, t.periodo) for t in outras)
+
+    def utilizacao(self):
+        if self.variavel is None:
+            return sum(Fraction(int(c), int(p)) for c, p in zip(self.custos, self.periodos))
+        i = self.variavel
+        return self.utilizacao_outras + Fraction(int(self.custos[i]), int(self.periodos[i]))
+
+    def limite(self):
+        # La de Zhang & Burns (U < 1) ou, com U = 1, o período ocupado síncrono.
+        # Sem o min com o período ocupado de limite_demanda_edf: perto de U = 1
+        # ele custa tanto quanto a própria descida. Supõe U <= 1.
+        U = self.utilizacao()
+        if U == 1:
+            w = int(self.custos.sum())
+            while True:
+                novo = int(np.dot(-(-w // self.periodos), self.custos))
+                if novo == w:
+                    return w
+                w = novo
+        if self.variavel is None:
+            soma = sum((int(p) - int(d)) * Fraction(int(c), int(p))
+                       for p, d, c in zip(self.periodos, self.deadlines, self.custos))
+        else:
+            i = self.variavel
+            p, d, c = int(self.periodos[i]), int(self.deadlines[i]), int(self.custos[i])
+            soma = self.soma_outras + (p - d) * Fraction(c, p)
+        return max(int(self.deadlines.max()), math.ceil(soma / (1 - U)))
+
+    def demanda(self, t):
+        # h(t), como demanda_processador
+        return int(np.dot(np.maximum(0, (t - self.deadlines) // self.periodos + 1), self.custos))
+
+    def demandas_ate(self, t):
+        # Todos os deadlines absolutos <= t, em ordem, e h em cada um deles: a
+        # soma acumulada dos C na ordem dos deadlines
+        partes = [(np.arange(d, t + 1, p), c) for p, d, c in zip(self.periodos, self.deadlines, self.custos) if d <= t]
+        if not partes:
+            vazio = np.zeros(0, dtype=self.periodos.dtype)
+            return vazio, vazio
+        instantes = np.concatenate([a for a, _ in partes])
+        custos = np.concatenate([np.full(len(a), c, dtype=self.custos.dtype) for a, c in partes])
+        ordem = np.argsort(instantes, kind="stable")
+        instantes, demandas = instantes[ordem], np.cumsum(custos[ordem])
+        # Deadlines repetidos: vale a soma do último
+        ultimo = np.append(instantes[1:] != instantes[:-1], True)
+        return instantes[ultimo], demandas[ultimo]
+
+    def deadline_antes(self, t):
+        # Maior deadline absoluto < t, como maior_deadline_antes
+        antes = self.deadlines < t
+        if not antes.any():
+            return None
+        periodos, deadlines = self.periodos[antes], self.deadlines[antes]
+        return int(((-(-(t - deadlines) // periodos) - 1) * periodos + deadlines).max())
+
+    def percorrer(self, t, piso=0):
+        # Quick Processor-demand Analysis de Zhang & Burns, descendo a partir de t
+        # (tudo acima de t já deve estar verificado): em vez de testar todo
+        # deadline, salta de t para h(t), pois h(x) <= h(t) <= x em [h(t), t].
+        # Para ao chegar em 'piso', se até ele já foi verificado.
+        # Devolve (t, passos) com o t em que h(t) > t, ou (None, passos).
+        d_min, d_max = int(self.deadlines.min()), int(self.deadlines.max())
+        total = int(self.custos.sum())
+        passos = 0
+        while t is not None and t > piso:
+            passos += 1
+            if t >= d_max:
+                # Toda tarefa já tem instância em [0, t]: h(t) dispensa o max(0, ...)
+                h = int(np.dot((t - self.deadlines) // self.periodos, self.custos)) + total
+            else:
+                h = self.demanda(t)
+            if h > t:
+                return t, passos
+            if h <= d_min:
+                return None, passos
+            t = h if h < t else self.deadline_antes(t)
+        return None, passos
+
+    def procurar(self, limite):
+        # O QPA de 'limite' para baixo, em faixas que dobram de tamanho a partir
+        # de 2 * D máximo, da mais baixa para a mais alta. Perto de U = 1 os
+        # passos se concentram perto de La; uma falha mais abaixo aparece sem
+        # passar por eles. Se passa, custa o mesmo que uma descida só.
+        # Devolve um t com h(t) > t (não necessariamente o menor) ou None.
+        piso, topo = 0, min(limite, 2 * int(self.deadlines.max()))
+        while True:
+            falha, _ = self.percorrer(self.deadline_antes(topo + 1), piso)
+            if falha is not None or topo >= limite:
+                return falha
+            piso, topo = topo, min(limite, 2 * topo)
+
+def teste_qpa_edf(tarefas):
+    # Teste exato de escalonabilidade EDF pelo critério de demanda do processador
+    # (h(t) <= t para todo t até L), percorrido com o QPA (DemandaEDF.percorrer).
+    # Em caso de falha, 'intervalo_falha' é o menor t com h(t) > t.
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    if U > 1:
+        return {'escalonavel': False, 'intervalo_falha': None, 'demanda': None,
+                'limite': None, 'passos': 0, 'utilizacao': float(U)}
+
+    limite = limite_demanda_edf(tarefas)
+    # Cada parcela de h(t) fica abaixo de t: int64 serve até perto de 2^63
+    demanda = DemandaEDF(tarefas, tipo=np.int64 if limite < 2**62 else object)
+    falha, passos = demanda.percorrer(demanda.deadline_antes(limite + 1))
+
+    resultado = {'escalonavel': True, 'intervalo_falha': None, 'demanda': None,
+                 'limite': limite, 'passos': passos, 'utilizacao': float(U)}
+    if falha is not None:
+        # O QPA achou algum t com h(t) > t; procura o primeiro deadline que falha
+        falha = menor_intervalo_falha(tarefas, falha)
+        resultado.update(escalonavel=False, intervalo_falha=falha,
+                         demanda=demanda_processador(tarefas, falha))
+    return resultado
+
+def horizonte_verificacao(tarefas, tipo_analise="edf"):
+    # Horizonte de simulação mais curto que ainda dá um veredito completo de
+    # perda de deadline com todas as tarefas liberadas juntas em 0:
+    # - EDF: até L = limite_demanda_edf, pois o primeiro deadline perdido é <= L;
+    # - DM/RM: até o fim do período ocupado síncrono, que contém o instante
+    #   crítico de todas as tarefas e onde toda instância liberada já terminou.
+    # Com U > 1 não há horizonte finito menor que o hiperperíodo.
+    hiper_periodo = calcular_mmc_lista([t.periodo for t in tarefas])
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    if U > 1:
+        return {'horizonte': hiper_periodo, 'criterio': "hiperperíodo (U > 1)", 'hiper_periodo': hiper_periodo}
+
+    if tipo_analise.lower() == "edf":
+        L = limite_demanda_edf(tarefas)
+        criterio = "limite de demanda EDF"
+    else:
+        L = periodo_ocupado_sincrono(tarefas)
+        criterio = "período ocupado síncrono"
+    if L >= hiper_periodo:
+        return {'horizonte': hiper_periodo, 'criterio': "hiperperíodo", 'hiper_periodo': hiper_periodo}
+    return {'horizonte': max(L, 1), 'criterio': criterio, 'hiper_periodo': hiper_periodo}
+
+def limite_hiperbolico(utilizacoes):
+    # Bini & Buttazzo: prod(Ui + 1) <= 2; domina o de Liu & Layland
+    produto = Fraction(1)
+    for u in utilizacoes:
+        produto *= u + 1
+        if produto > 2:
+            return False
+    return True
+
+def verificar_escalonabilidade(tarefas, tipo_analise="edf", simular=False, progresso=None, detalhes=False):
+    # Pipeline de escalonabilidade em ordem de custo; para no primeiro nível que decide:
+    # 1. necessário: U > 1 ou algum C > D rejeita;
+    # 2. limites suficientes, O(n): EDF aceita com U <= 1 se D >= T e com a
+    #    densidade sum(C/min(D, T)) <= 1; DM/RM aceitam pelo limite hiperbólico
+    #    sobre min(D, T) (que domina o de Liu & Layland), quando a ordem de
+    #    prioridade segue min(D, T) (o conjunto com períodos min(D, T) é mais
+    #    exigente e é RM);
+    # 3. exato: QPA (EDF) ou RTA (DM/RM, com as prioridades já atribuídas);
+    # 4. simulação: só com simular=True, quando o traço é pedido; roda até o
+    #    horizonte de verificação e devolve 'instancias', 'intervalos' e 'horizonte'.
+    # Cada nível vai em 'niveis' com seu veredito (None = inconclusivo) e tempo;
+    # 'nivel' e 'teste' dizem quem decidiu. O exato também deixa 'qpa' ou 'analise'.
+    # Com detalhes=True o exato roda mesmo depois de um nível anterior decidir
+    # (a tabela por tarefa da interface precisa dele); o veredito não muda.
+    tipo = tipo_analise.lower()
+    niveis = []
+    resultado = {'escalonavel': None, 'nivel': None, 'teste': None, 'niveis': niveis}
+    inicio_total = time.perf_counter()
+
+    def registrar(nivel, teste, veredito, inicio):
+        niveis.append({'nivel': nivel, 'teste': teste, 'veredito': veredito,
+                       'tempo_s': time.perf_counter() - inicio})
+        if veredito is not None and resultado['escalonavel'] is None:
+            resultado.update(escalonavel=veredito, nivel=nivel, teste=teste)
+        return veredito is not None and not simular
+
+    def concluir():
+        resultado['tempo_s'] = time.perf_counter() - inicio_total
+        return resultado
+
+    inicio = time.perf_counter()
+    utilizacoes = [Fraction(t.tempo_computacao, t.periodo) for t in tarefas]
+    resultado['utilizacao'] = float(sum(utilizacoes))
+    if sum(utilizacoes) > 1:
+        if registrar("necessário", "U > 1", False, inicio) and not detalhes:
+            return concluir()
+    elif any(t.tempo_computacao > t.deadline for t in tarefas):
+        if registrar("necessário", "C > D", False, inicio) and not detalhes:
+            return concluir()
+
+    if resultado['escalonavel'] is None:
+        inicio = time.perf_counter()
+        if tipo == "edf":
+            if all(t.deadline >= t.periodo for t in tarefas):
+                decidiu = registrar("limite", "U <= 1 (D >= T)", True, inicio)
+            else:
+                densidade = sum(Fraction(t.tempo_computacao, min(t.deadline, t.periodo)) for t in tarefas)
+                decidiu = registrar("limite", "densidade", True if densidade <= 1 else None, inicio)
+        else:
+            ordenadas = sorted(tarefas, key=lambda x: x.prioridade)
+            prazos = [min(t.deadline, t.periodo) for t in ordenadas]
+            taxas = [Fraction(t.tempo_computacao, r) for t, r in zip(ordenadas, prazos)]
+            decidiu = False
+            if all(a <= b for a, b in zip(prazos, prazos[1:])):
+                decidiu = registrar("limite", "hiperbólico", True if limite_hiperbolico(taxas) else None, inicio)
+        if decidiu and not detalhes:
+            return concluir()
+
+    if resultado['escalonavel'] is None or simular or detalhes:
+        inicio = time.perf_counter()
+        if tipo == "edf":
+            resultado['qpa'] = teste_qpa_edf(tarefas)
+            decidiu = registrar("exato", "QPA", resultado['qpa']['escalonavel'], inicio)
+        else:
+            resultado['analise'] = analise_tempo_resposta(tarefas)
+            decidiu = registrar("exato", "RTA", all(a['escalonavel'] for a in resultado['analise']), inicio)
+        if decidiu:
+            return concluir()
+
+    if simular:
+        inicio = time.perf_counter()
+        horizonte = horizonte_verificacao(tarefas, tipo)
+        instancias = gerar_instancias(tarefas, horizonte['horizonte'])
+        intervalos = escalonamento_eventos(instancias, horizonte['horizonte'], tipo, progresso)
+        perdas = perdas_de_deadline(instancias, intervalos, horizonte['horizonte'])
+        resultado.update(horizonte=horizonte, instancias=instancias, intervalos=intervalos)
+        registrar("simulação", "simulação", resultado['utilizacao'] <= 1 and not perdas, inicio)
+    return concluir()
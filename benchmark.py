@@ -0,0 +1,276 @@
+# Benchmarks reprodutíveis dos motores de escalonamento. Roda sem display
+# (matplotlib em backend Agg).
+#
+# python benchmark.py suite -o resultados.json [--comparar anterior.json]
+#     Varre número de tarefas, hiperperíodo e utilização com conjuntos de
+#     semente fixa; mede tempo e pico de memória de cada fase (calcular_mmc_lista,
+#     gerar_instancias, escalonador por tick, construir_intervalos, escalonador
+#     por tick com as tarefas normalizadas pelo MDC, escalonamento_eventos,
+#     plotar_simulacao e desenho da figura) e grava JSON. Com --escala k, os
+#     parâmetros dos conjuntos são multiplicados por k (ms múltiplos de 5, 10...).
+# python benchmark.py instancias
+#     Representação das instâncias: dict por instância (formato antigo) contra
+#     o registro Instancia com __slots__, num hiperperíodo de ~1 milhão de jobs.
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from tarefas import Tarefa, calcular_mmc_lista, normalizar_tarefas
+from escalonadores import (atribuir_prioridades_dm, atribuir_prioridades_rm, gerar_instancias,
+                           escalonamento_edf, escalonamento_dm, escalonamento_rm,
+                           escalonamento_eventos, construir_intervalos, desnormalizar)
+from gerador import uunifast
+
+def conjunto_milhao():
+    # U = 0.85 e ~0.85 jobs por ms: 1.2 milhão de ms dão ~1 milhão de jobs
+    tarefas = [
+        Tarefa("t1", 4, 4, 1),
+        Tarefa("t2", 4, 4, 1),
+        Tarefa("t3", 5, 5, 1),
+        Tarefa("t4", 10, 10, 1),
+        Tarefa("t5", 20, 20, 1),
+    ]
+    return tarefas, 1_200_000
+
+def gerar_instancias_dict(tarefas, hiper_periodo):
+    # Formato anterior: um dict com chaves string por instância
+    instancias = []
+    for t in tarefas:
+        k = 0
+        while k * t.periodo < hiper_periodo:
+            tempo_liberacao = k * t.periodo
+            instancias.append({
+                'nome_tarefa': t.nome,
+                'tempo_liberacao': tempo_liberacao,
+                'deadline_absoluto': tempo_liberacao + t.deadline,
+                'tempo_restante': t.tempo_computacao,
+                'execucao_id': k + 1,
+                'prioridade': t.prioridade
+            })
+            k += 1
+    return instancias
+
+def medir(funcao, *args):
+    # Devolve (resultado, segundos)
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+def melhor_tempo(funcao, *args, coletor=True, repeticoes=3):
+    # Menor tempo de algumas chamadas, com o coletor de ciclos ligado ou
+    # desligado só durante elas (o timeit desliga); o resultado é descartado
+    # a cada chamada e o estado anterior do processo é restaurado
+    coletor_ativo = gc.isenabled()
+    tempos = []
+    try:
+        for _ in range(repeticoes):
+            gc.collect()
+            if coletor:
+                gc.enable()
+            else:
+                gc.disable()
+            tempos.append(medir(funcao, *args)[1])
+    finally:
+        if coletor_ativo:
+            gc.enable()
+        else:
+            gc.disable()
+    return min(tempos)
+
+def medir_memoria(funcao, *args):
+    # Devolve (resultado, pico de memória em MB); separado do tempo porque o
+    # tracemalloc deixa tudo mais lento
+    tracemalloc.start()
+    resultado = funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, pico / 2**20
+
+def percorrer_dict(instancias):
+    # Laço típico do escalonador: lê liberação/deadline e decrementa o restante
+    for j in instancias:
+        if j['tempo_liberacao'] <= j['deadline_absoluto']:
+            j['tempo_restante'] -= 1
+
+def percorrer_slots(instancias):
+    for j in instancias:
+        if j.tempo_liberacao <= j.deadline_absoluto:
+            j.tempo_restante -= 1
+
+def benchmark_instancias():
+    tarefas, hiper_periodo = conjunto_milhao()
+
+    # Os dois lados nas mesmas condições: com o coletor de ciclos ligado (um dict
+    # só com valores atômicos não é rastreado por ele, um registro com __slots__
+    # é) e com ele desligado
+    _, m_dict = medir_memoria(gerar_instancias_dict, tarefas, hiper_periodo)
+    t_dict = melhor_tempo(gerar_instancias_dict, tarefas, hiper_periodo)
+    s_dict = melhor_tempo(gerar_instancias_dict, tarefas, hiper_periodo, coletor=False)
+    dicts = gerar_instancias_dict(tarefas, hiper_periodo)
+    _, a_dict = medir(percorrer_dict, dicts)
+    del dicts
+
+    _, m_slots = medir_memoria(gerar_instancias, tarefas, hiper_periodo)
+    t_slots = melhor_tempo(gerar_instancias, tarefas, hiper_periodo)
+    s_slots = melhor_tempo(gerar_instancias, tarefas, hiper_periodo, coletor=False)
+    registros = gerar_instancias(tarefas, hiper_periodo)
+    _, a_slots = medir(percorrer_slots, registros)
+    registros = gerar_instancias(tarefas, hiper_periodo)
+    _, t_sim = medir(escalonamento_eventos, registros, hiper_periodo, "edf")
+
+    print(f"{len(registros)} instâncias, hiperperíodo = {hiper_periodo} ms")
+    print(f"{'':<22}{'dict':>12}{'__slots__':>12}{'ganho':>8}")
+    print(f"{'geração (s)':<22}{t_dict:>12.3f}{t_slots:>12.3f}{t_dict / t_slots:>7.2f}x")
+    print(f"{'geração s/ coletor (s)':<22}{s_dict:>12.3f}{s_slots:>12.3f}{s_dict / s_slots:>7.2f}x")
+    print(f"{'memória (MB)':<22}{m_dict:>12.1f}{m_slots:>12.1f}{m_dict / m_slots:>7.2f}x")
+    print(f"{'acesso aos campos (s)':<22}{a_dict:>12.3f}{a_slots:>12.3f}{a_dict / a_slots:>7.2f}x")
+    print(f"escalonamento_eventos EDF sobre os registros: {t_sim:.3f} s")
+
+ESCALONADORES_TICK = {'edf': escalonamento_edf, 'dm': escalonamento_dm, 'rm': escalonamento_rm}
+
+def conjunto_benchmark(n, utilizacao, hiper_periodo, semente, escala=1):
+    # Conjunto de semente fixa com hiperperíodo exato: um período é o próprio
+    # hiper_periodo e os demais são divisores dele (>= 10); com 'escala', todos
+    # os parâmetros (e o hiperperíodo) ficam multiplicados por ela
+    rng = random.Random(f"{semente}:{n}:{utilizacao}:{hiper_periodo}")
+    divisores = [d for d in range(10, hiper_periodo + 1) if hiper_periodo % d == 0]
+    periodos = [hiper_periodo] + [rng.choice(divisores) for _ in range(n - 1)]
+    rng.shuffle(periodos)
+    tarefas = []
+    for i, (u, periodo) in enumerate(zip(uunifast(n, utilizacao, rng), periodos)):
+        c = min(periodo, max(1, round(u * periodo)))
+        tarefas.append(Tarefa(f"tarefa{i + 1}", periodo * escala, periodo * escala, c * escala))
+    return tarefas
+
+def escalonamento_tick_normalizado(tarefas, hiper_periodo, tipo):
+    # Geração e escalonador por tick em unidades de mdc(P, D, C), com os
+    # intervalos devolvidos em ms
+    normalizadas, escala = normalizar_tarefas(tarefas)
+    instancias = gerar_instancias(normalizadas, hiper_periodo // escala)
+    intervalos = ESCALONADORES_TICK[tipo](instancias, hiper_periodo // escala, True)
+    return desnormalizar(instancias, intervalos, escala)
+
+def desenhar(fig):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    FigureCanvasAgg(fig).draw()
+
+def executar_fases(tarefas, tipo, plotar, medir):
+    # Pipeline completo do App.executar, medindo cada fase com 'medir'
+    medidas = {}
+    hiper_periodo, medidas['mmc'] = medir(calcular_mmc_lista, [t.periodo for t in tarefas])
+    instancias, medidas['gerar_instancias'] = medir(gerar_instancias, tarefas, hiper_periodo)
+    linha_do_tempo, medidas['escalonamento_tick'] = medir(ESCALONADORES_TICK[tipo], instancias, hiper_periodo)
+    _, medidas['construir_intervalos'] = medir(construir_intervalos, linha_do_tempo)
+    del linha_do_tempo
+    _, medidas['escalonamento_tick_normalizado'] = medir(escalonamento_tick_normalizado, tarefas, hiper_periodo, tipo)
+
+    instancias = gerar_instancias(tarefas, hiper_periodo)
+    intervalos, medidas['escalonamento_eventos'] = medir(escalonamento_eventos, instancias, hiper_periodo, tipo)
+    if plotar:
+        from plotagem import plotar_simulacao
+        fig, medidas['plotar_simulacao'] = medir(plotar_simulacao, tarefas, intervalos, instancias, tipo)
+        _, medidas['desenho'] = medir(desenhar, fig)
+    return medidas
+
+def benchmark_suite(lista_tarefas, hiper_periodos, utilizacoes, algoritmos, semente=0, plot_max=1000, escala=1):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    resultados = []
+    for n in lista_tarefas:
+        for hiper_periodo in hiper_periodos:
+            for utilizacao in utilizacoes:
+                for tipo in algoritmos:
+                    tarefas = conjunto_benchmark(n, utilizacao, hiper_periodo, semente, escala)
+                    if tipo == "dm":
+                        atribuir_prioridades_dm(tarefas)
+                    elif tipo == "rm":
+                        atribuir_prioridades_rm(tarefas)
+                    plotar = hiper_periodo * escala <= plot_max
+
+                    # Tempo e memória em passadas separadas: tracemalloc distorce o tempo
+                    tempos = executar_fases(tarefas, tipo, plotar, medir)
+                    memorias = executar_fases(tarefas, tipo, plotar, medir_memoria)
+
+                    for fase, segundos in tempos.items():
+                        resultados.append({
+                            'tarefas': n, 'hiper_periodo': hiper_periodo, 'utilizacao': utilizacao,
+                            'escala': escala, 'algoritmo': tipo, 'fase': fase,
+                            'tempo_s': segundos, 'pico_mb': memorias[fase],
+                        })
+                        print(f"n={n:<3} H={hiper_periodo:<8} U={utilizacao:<5} {tipo:<4} {fase:<32}"
+                              f"{segundos:>10.4f} s {memorias[fase]:>9.2f} MB", file=sys.stderr)
+    return resultados
+
+def chave_resultado(r):
+    return (r['tarefas'], r['hiper_periodo'], r['utilizacao'], r.get('escala', 1), r['algoritmo'], r['fase'])
+
+def comparar(resultados, caminho_base):
+    # Razão atual/base de cada fase presente nos dois arquivos (< 1 = melhorou)
+    with open(caminho_base, encoding="utf-8") as f:
+        base = {chave_resultado(r): r for r in json.load(f)['resultados']}
+    print(f"{'n':>4}{'H':>10}{'U':>6} {'alg':<4} {'fase':<32}{'tempo':>9}{'memória':>9}")
+    for r in resultados:
+        b = base.get(chave_resultado(r))
+        if b is None:
+            continue
+        razao_tempo = r['tempo_s'] / b['tempo_s'] if b['tempo_s'] else float('nan')
+        razao_memoria = r['pico_mb'] / b['pico_mb'] if b['pico_mb'] else float('nan')
+        print(f"{r['tarefas']:>4}{r['hiper_periodo']:>10}{r['utilizacao']:>6} {r['algoritmo']:<4} "
+              f"{r['fase']:<32}{razao_tempo:>8.2f}x{razao_memoria:>8.2f}x")
+
+def lista_de(tipo):
+    return lambda texto: [tipo(x) for x in texto.split(",") if x.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos motores de escalonamento")
+    sub = parser.add_subparsers(dest="comando")
+    suite = sub.add_parser("suite", help="varredura com tempo e memória por fase")
+    suite.add_argument("--tarefas", type=lista_de(int), default=[5, 10, 20])
+    suite.add_argument("--hiperperiodos", type=lista_de(int), default=[1000, 10000, 100000])
+    suite.add_argument("--utilizacoes", type=lista_de(float), default=[0.5, 0.9])
+    suite.add_argument("--algoritmos", type=lista_de(str), default=["edf", "dm", "rm"])
+    suite.add_argument("--semente", type=int, default=0)
+    suite.add_argument("--escala", type=int, default=1,
+                       help="multiplica períodos, deadlines e tempos de computação dos conjuntos")
+    suite.add_argument("--plot-max", type=int, default=1000,
+                       help="maior hiperperíodo em que plotar_simulacao é medido")
+    suite.add_argument("-o", "--saida", default="-", help="JSON de resultados (padrão: stdout)")
+    suite.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    sub.add_parser("instancias", help="dict x __slots__ num hiperperíodo de ~1 milhão de jobs")
+    args = parser.parse_args(argv)
+
+    if args.comando == "instancias":
+        benchmark_instancias()
+        return
+    if args.comando is None:
+        args = parser.parse_args(["suite"])
+
+    resultados = benchmark_suite(args.tarefas, args.hiperperiodos, args.utilizacoes,
+                                 args.algoritmos, args.semente, args.plot_max, args.escala)
+    documento = {
+        'metadados': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'semente': args.semente,
+            'escala': args.escala,
+            'data': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'resultados': resultados,
+    }
+    if args.saida == "-":
+        json.dump(documento, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(documento, f, indent=1)
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+if __name__ == "__main__":
+    main()
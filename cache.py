@@ -0,0 +1,76 @@
+# Cache de resultados de simulação endereçado pelo conteúdo: a chave é um hash
+# dos parâmetros normalizados das tarefas, do algoritmo e do modo de horizonte,
+# então o mesmo conjunto reaproveita o resultado mesmo vindo de outro objeto.
+# Mantém um LRU em memória e, opcionalmente, um diretório com um pickle por chave.
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+def chave_simulacao(tarefas, tipo_analise, modo_horizonte="hiperperiodo", **extras):
+    # A ordem das tarefas entra na chave: tarefa_id (e a linha no gráfico) vem dela.
+    # 'extras' separa resultados de natureza diferente (ex.: registro do lote x escalonamento).
+    conteudo = {
+        'tarefas': [[str(t.nome).strip(), int(t.periodo), int(t.deadline), int(t.tempo_computacao)] for t in tarefas],
+        'algoritmo': tipo_analise.lower(),
+        'horizonte': modo_horizonte,
+        **extras,
+    }
+    texto = json.dumps(conteudo, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+class CacheSimulacao:
+    def __init__(self, capacidade=8, diretorio=None):
+        self.capacidade = capacidade
+        self.diretorio = diretorio
+        self.memoria = OrderedDict()
+        self.trava = threading.Lock()
+        if diretorio is not None:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def caminho(self, chave):
+        return os.path.join(self.diretorio, chave + ".pickle")
+
+    def obter(self, chave):
+        # Devolve o resultado guardado ou None; um acerto no disco volta para a memória
+        with self.trava:
+            if chave in self.memoria:
+                self.memoria.move_to_end(chave)
+                return self.memoria[chave]
+        if self.diretorio is None:
+            return None
+        try:
+            with open(self.caminho(chave), "rb") as f:
+                resultado = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self.lembrar(chave, resultado)
+        return resultado
+
+    def guardar(self, chave, resultado, persistir=True):
+        # persistir=False mantém só em memória (ex.: figuras do matplotlib)
+        self.lembrar(chave, resultado)
+        if self.diretorio is None or not persistir:
+            return
+        # Grava num temporário e renomeia: processos do lote podem gravar a mesma chave
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as f:
+                pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, self.caminho(chave))
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+    def lembrar(self, chave, resultado):
+        with self.trava:
+            self.memoria[chave] = resultado
+            self.memoria.move_to_end(chave)
+            while len(self.memoria) > self.capacidade:
+                self.memoria.popitem(last=False)
+
+    def __len__(self):
+        return len(self.memoria)
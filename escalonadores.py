@@ -1,3 +1,17 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from itertools import islice, repeat
+from operator import attrgetter, itemgetter
+
+# Intervalo (em instâncias geradas ou eventos simulados) entre chamadas de progresso
+PASSOS_PROGRESSO = 4096
+# Eventos simulados entre dois checkpoints de escalonamento_eventos
+INTERVALO_CHECKPOINT = 1024
+
+class SimulacaoCancelada(Exception):
+    # Levantada pela função de progresso para interromper a geração/simulação
+    pass
+
 def atribuir_prioridades_dm(tarefas):
     # Deadline Monotonic: quanto menor o deadline, maior a prioridade
     tarefas_ordenadas = sorted(tarefas, key=lambda x: x.deadline)
@@ -10,120 +24,575 @@ def atribuir_prioridades_rm(tarefas):
     tarefas_ordenadas = sorted(tarefas, key=lambda x: x.periodo)
     for i, t in enumerate(tarefas_ordenadas):
         t.prioridade = i + 1
-    
-    # Verificação de escalonabilidade sob RM
-    n = len(tarefas)
-    # Soma das utilizações: U = sum(Ci/Ti)
-    U = sum((t.tempo_computacao / t.periodo) for t in tarefas)
-    # Limite de escalonabilidade: n*(2^(1/n)-1)
-    limite = n * (2**(1/n) - 1)
-
-    if U > limite:
-        print("Aviso: O conjunto de tarefas não é escalonável sob RM!")
-    else:
-        print("Conjunto de tarefas escalonável sob RM.")
-    
+    # Os testes de escalonabilidade ficam em analise.verificar_escalonabilidade
     return tarefas
 
-def gerar_instancias(tarefas, hiper_periodo):
+class Instancia:
+    # Registro compacto de uma instância (job). Com __slots__ não há um dict
+    # por objeto; 'tarefa_id' é a posição da tarefa na lista de tarefas
+    __slots__ = ('tarefa_id', 'nome_tarefa', 'tempo_liberacao', 'deadline_absoluto',
+                 'tempo_restante', 'execucao_id', 'prioridade')
+
+    def __init__(self, tarefa_id, nome_tarefa, tempo_liberacao, deadline_absoluto,
+                 tempo_restante, execucao_id, prioridade=None):
+        self.tarefa_id = tarefa_id
+        self.nome_tarefa = nome_tarefa
+        self.tempo_liberacao = tempo_liberacao
+        self.deadline_absoluto = deadline_absoluto
+        self.tempo_restante = tempo_restante
+        self.execucao_id = execucao_id
+        self.prioridade = prioridade
+
+    def __repr__(self):
+        return (f"Instancia({self.nome_tarefa}#{self.execucao_id}, liberacao={self.tempo_liberacao}, "
+                f"deadline={self.deadline_absoluto}, restante={self.tempo_restante})")
+
+def nova_instancia(tarefa_id, t, k):
+    tempo_liberacao = k * t.periodo
+    return Instancia(tarefa_id, t.nome, tempo_liberacao, tempo_liberacao + t.deadline,
+                     t.tempo_computacao, k + 1, t.prioridade)
+
+def gerar_instancias(tarefas, hiper_periodo, progresso=None):
+    # progresso(feitas, total), se fornecido, é chamado a cada PASSOS_PROGRESSO instâncias
+    # de uma tarefa (e ao fim de cada tarefa)
+    if progresso is not None:
+        total = sum(-(-hiper_periodo // t.periodo) for t in tarefas)
     instancias = []
-    for t in tarefas:
+    for tarefa_id, t in enumerate(tarefas):
+        # Registros montados em bloco por tarefa: map sobre as colunas, sem uma
+        # chamada Python (nem nova_instancia) por job
+        nome, deadline, c, prioridade = t.nome, t.deadline, t.tempo_computacao, t.prioridade
+        liberacoes = range(0, hiper_periodo, t.periodo)
+        for inicio in range(0, len(liberacoes), PASSOS_PROGRESSO):
+            bloco = liberacoes[inicio:inicio + PASSOS_PROGRESSO]
+            instancias.extend(map(Instancia, repeat(tarefa_id, len(bloco)), repeat(nome), bloco,
+                                  range(bloco.start + deadline, bloco.stop + deadline, bloco.step),
+                                  repeat(c), range(inicio + 1, inicio + len(bloco) + 1),
+                                  repeat(prioridade)))
+            if progresso is not None:
+                progresso(len(instancias), total)
+    return instancias
+
+def gerar_instancias_stream(tarefas, hiper_periodo):
+    # Versão preguiçosa de gerar_instancias: produz as instâncias em ordem de
+    # liberação intercalando um fluxo por tarefa, então só há uma instância
+    # pendente por tarefa em memória (e não o hiperperíodo inteiro).
+    # Empates na liberação saem na ordem de 'tarefas', como em indice_liberacoes.
+    def fluxo(tarefa_id, t):
         k = 0
         while k * t.periodo < hiper_periodo:
-            tempo_liberacao = k * t.periodo
-            deadline_absoluto = tempo_liberacao + t.deadline
-            instancias.append({
-                'nome_tarefa': t.nome,
-                'tempo_liberacao': tempo_liberacao,
-                'deadline_absoluto': deadline_absoluto,
-                'tempo_restante': t.tempo_computacao,
-                'execucao_id': k + 1,
-                'prioridade': t.prioridade if t.prioridade is not None else None
-            })
+            yield nova_instancia(tarefa_id, t, k)
             k += 1
-    return instancias
+    return heapq.merge(*(fluxo(tarefa_id, t) for tarefa_id, t in enumerate(tarefas)),
+                       key=attrgetter('tempo_liberacao'))
 
-def escalonamento_edf(instancias, tempo_total):
-    linha_do_tempo = []
-    tarefas_prontas = []
+class FilaProntos:
+    # Fila de prontos em heap: inserção e remoção da mais prioritária em O(log n).
+    # Chave: deadline absoluto (EDF) ou prioridade fixa (DM/RM). Empates são
+    # resolvidos por quem foi liberado antes e depois pela ordem de inserção.
+    def __init__(self, campo):
+        self.campo = campo
+        self.chave = attrgetter(campo)
+        self.heap = []
+        self.contador = 0
 
-    for tempo in range(tempo_total):
-        for instancia in instancias:
-            if instancia['tempo_liberacao'] == tempo:
-                tarefas_prontas.append(instancia)
+    def inserir(self, instancia):
+        heapq.heappush(self.heap, (self.chave(instancia), instancia.tempo_liberacao, self.contador, instancia))
+        self.contador += 1
 
-        tarefas_prontas = [t for t in tarefas_prontas if t['tempo_restante'] > 0]
+    def topo(self):
+        return self.heap[0][-1]
 
-        if tarefas_prontas:
-            tarefas_prontas.sort(key=lambda x: x['deadline_absoluto'])
-            tarefa_em_execucao = tarefas_prontas[0]
-            tarefa_em_execucao['tempo_restante'] -= 1
-            linha_do_tempo.append((tempo, tarefa_em_execucao))
-        else:
-            linha_do_tempo.append((tempo, None))
-    return linha_do_tempo
+    def remover_topo(self):
+        return heapq.heappop(self.heap)[-1]
 
-def escalonamento_dm(instancias, tempo_total):
-    # Deadline Monotonic
+    def retirar_primeiras(self, k):
+        # As k entradas mais prioritárias, fora do heap; devolver() as recoloca
+        # com a mesma chave e posição de desempate (usado com várias CPUs)
+        return [heapq.heappop(self.heap) for _ in range(min(k, len(self.heap)))]
+
+    def devolver(self, entrada):
+        heapq.heappush(self.heap, entrada)
+
+    def __len__(self):
+        return len(self.heap)
+
+def campo_prioridade(tipo_analise):
+    # EDF ordena pelo deadline absoluto; DM e RM pela prioridade fixa
+    return 'deadline_absoluto' if tipo_analise.lower() == "edf" else 'prioridade'
+
+def indice_liberacoes(instancias):
+    # Instâncias ordenadas pelo instante de liberação (sort estável: empates
+    # ficam na ordem de 'instancias')
+    return sorted(instancias, key=attrgetter('tempo_liberacao'))
+
+def fluxo_liberacoes(instancias):
+    # Listas são ordenadas por indice_liberacoes; qualquer outro iterável (por
+    # exemplo gerar_instancias_stream) já vem em ordem de liberação e é
+    # consumido sob demanda
+    if isinstance(instancias, list):
+        return iter(indice_liberacoes(instancias))
+    return iter(instancias)
+
+def registrar_execucao(intervalos, instancia, inicio, fim):
+    # Acrescenta o trecho (instancia, inicio, fim), estendendo o último
+    # intervalo se for a mesma instância continuando sem interrupção
+    if intervalos and intervalos[-1][0] is instancia and intervalos[-1][2] == inicio:
+        intervalos[-1] = (instancia, intervalos[-1][1], fim)
+    else:
+        intervalos.append((instancia, inicio, fim))
+
+def escalonamento_por_tick(instancias, tempo_total, campo, intervalos=False):
+    # Com intervalos=True devolve direto [(instancia, inicio, fim)] em vez de
+    # uma entrada (tempo, instancia) por ms
     linha_do_tempo = []
-    tarefas_prontas = []
+    tarefas_prontas = FilaProntos(campo)
+    liberacoes = fluxo_liberacoes(instancias)
+    proxima = next(liberacoes, None)
+
     for tempo in range(tempo_total):
-        for instancia in instancias:
-            if instancia['tempo_liberacao'] == tempo:
-                tarefas_prontas.append(instancia)
-        tarefas_prontas = [t for t in tarefas_prontas if t['tempo_restante'] > 0]
+        while proxima is not None and proxima.tempo_liberacao <= tempo:
+            if proxima.tempo_restante > 0:
+                tarefas_prontas.inserir(proxima)
+            proxima = next(liberacoes, None)
 
         if tarefas_prontas:
-            tarefas_prontas.sort(key=lambda x: x['prioridade'])
-            tarefa_em_execucao = tarefas_prontas[0]
-            tarefa_em_execucao['tempo_restante'] -= 1
-            linha_do_tempo.append((tempo, tarefa_em_execucao))
-        else:
+            tarefa_em_execucao = tarefas_prontas.topo()
+            tarefa_em_execucao.tempo_restante -= 1
+            # Instância concluída sai da fila na hora, sem filtragem a cada tick
+            if tarefa_em_execucao.tempo_restante <= 0:
+                tarefas_prontas.remover_topo()
+            if intervalos:
+                registrar_execucao(linha_do_tempo, tarefa_em_execucao, tempo, tempo + 1)
+            else:
+                linha_do_tempo.append((tempo, tarefa_em_execucao))
+        elif not intervalos:
             linha_do_tempo.append((tempo, None))
     return linha_do_tempo
 
-def escalonamento_rm(instancias, tempo_total):
+def escalonamento_edf(instancias, tempo_total, intervalos=False):
+    # Earliest Deadline First
+    return escalonamento_por_tick(instancias, tempo_total, 'deadline_absoluto', intervalos)
+
+def escalonamento_dm(instancias, tempo_total, intervalos=False):
+    # Deadline Monotonic
+    return escalonamento_por_tick(instancias, tempo_total, 'prioridade', intervalos)
+
+def escalonamento_rm(instancias, tempo_total, intervalos=False):
     # Rate Monotonic
-    linha_do_tempo = []
-    tarefas_prontas = []
-    for tempo in range(tempo_total):
-        for instancia in instancias:
-            if instancia['tempo_liberacao'] == tempo:
-                tarefas_prontas.append(instancia)
-        tarefas_prontas = [t for t in tarefas_prontas if t['tempo_restante'] > 0]
+    return escalonamento_por_tick(instancias, tempo_total, 'prioridade', intervalos)
 
-        if tarefas_prontas:
-            tarefas_prontas.sort(key=lambda x: x['prioridade'])
-            tarefa_em_execucao = tarefas_prontas[0]
-            tarefa_em_execucao['tempo_restante'] -= 1
-            linha_do_tempo.append((tempo, tarefa_em_execucao))
+def escalonamento_eventos(instancias, tempo_total, tipo_analise="edf", progresso=None, checkpoints=None, retomar=None,
+                          descarregar=None, parar_na_perda=False):
+    # Simulação orientada a eventos: em vez de avançar de 1 em 1 ms, o relógio
+    # salta direto para a próxima liberação ou conclusão. Gera o mesmo
+    # escalonamento que escalonamento_edf/dm/rm, já na forma de intervalos
+    # (instancia, inicio, fim), igual à saída de construir_intervalos.
+    # Aceita a lista de gerar_instancias ou o gerador de gerar_instancias_stream.
+    # progresso(tempo, tempo_total), se fornecido, é chamado a cada PASSOS_PROGRESSO eventos.
+    # checkpoints, se for uma lista, recebe um retrato do estado a cada
+    # INTERVALO_CHECKPOINT eventos; retomar = (tempo, posicao, prontos, intervalos)
+    # continua a partir de um deles (ver ressimular).
+    # descarregar(intervalos), se fornecido, recebe a cada PASSOS_PROGRESSO eventos
+    # os intervalos já fechados e o resto no fim (ex.: EscritorTraco.escrever de
+    # traco.py); eles saem da memória e a lista devolvida fica vazia. Não combina
+    # com checkpoints, que guardam posições na lista (ValueError).
+    # Com parar_na_perda=True a simulação para na primeira perda de deadline, no
+    # instante em que o relógio chega ao deadline de uma instância ainda com
+    # trabalho (os deadlines pendentes viram eventos), e devolve
+    # (intervalos, perda) com perda = (instancia, tempo) ou None.
+    if descarregar is not None and checkpoints is not None:
+        raise ValueError("descarregar não combina com checkpoints")
+    tarefas_prontas = FilaProntos(campo_prioridade(tipo_analise))
+    # Deadlines das instâncias prontas, em heap: (deadline, ordem, instancia)
+    prazos = [] if parar_na_perda else None
+    perda = None
+    if retomar is None:
+        intervalos = []
+        tempo = 0
+        posicao = 0
+    else:
+        tempo, posicao, prontos, intervalos = retomar
+        for instancia in prontos:
+            if prazos is not None:
+                heapq.heappush(prazos, (instancia.deadline_absoluto, tarefas_prontas.contador, instancia))
+            tarefas_prontas.inserir(instancia)
+    liberacoes = fluxo_liberacoes(instancias)
+    if posicao:
+        liberacoes = islice(liberacoes, posicao, None)
+    proxima = next(liberacoes, None)
+    passos = 0
+    contar = progresso is not None or checkpoints is not None or descarregar is not None
+    while tempo < tempo_total:
+        if contar:
+            passos += 1
+            if progresso is not None and passos % PASSOS_PROGRESSO == 0:
+                progresso(tempo, tempo_total)
+            if descarregar is not None and passos % PASSOS_PROGRESSO == 0:
+                # O último intervalo ainda pode ser estendido por registrar_execucao
+                descarregar(intervalos[:-1])
+                del intervalos[:-1]
+            if checkpoints is not None and passos % INTERVALO_CHECKPOINT == 0:
+                checkpoints.append(retrato_checkpoint(tempo, posicao, tarefas_prontas, intervalos))
+
+        while proxima is not None and proxima.tempo_liberacao <= tempo:
+            if proxima.tempo_restante > 0:
+                if prazos is not None:
+                    heapq.heappush(prazos, (proxima.deadline_absoluto, tarefas_prontas.contador, proxima))
+                tarefas_prontas.inserir(proxima)
+            proxima = next(liberacoes, None)
+            posicao += 1
+
+        if proxima is not None:
+            proximo_evento = min(proxima.tempo_liberacao, tempo_total)
         else:
-            linha_do_tempo.append((tempo, None))
-    return linha_do_tempo
+            proximo_evento = tempo_total
+
+        if prazos is not None:
+            perda = deadline_vencido(prazos, tempo)
+            if perda is not None:
+                break
+            if prazos:
+                proximo_evento = min(proximo_evento, prazos[0][0])
+
+        if not tarefas_prontas:
+            # CPU ociosa até a próxima liberação
+            tempo = proximo_evento
+            continue
+
+        tarefa_em_execucao = tarefas_prontas.topo()
+        fim = min(tempo + tarefa_em_execucao.tempo_restante, proximo_evento)
+        tarefa_em_execucao.tempo_restante -= fim - tempo
+
+        registrar_execucao(intervalos, tarefa_em_execucao, tempo, fim)
+
+        if tarefa_em_execucao.tempo_restante <= 0:
+            tarefas_prontas.remover_topo()
+        tempo = fim
+    if descarregar is not None:
+        descarregar(intervalos)
+        intervalos = []
+    if prazos is not None:
+        if perda is None:
+            # Deadline exatamente no fim do horizonte
+            perda = deadline_vencido(prazos, tempo)
+        return intervalos, perda
+    return intervalos
+
+def deadline_vencido(prazos, tempo):
+    # (instancia, deadline) da instância pendente com deadline <= tempo, se houver;
+    # as concluídas saem do topo do heap aqui mesmo (remoção preguiçosa)
+    while prazos and prazos[0][-1].tempo_restante <= 0:
+        heapq.heappop(prazos)
+    if prazos and prazos[0][0] <= tempo:
+        return prazos[0][-1], prazos[0][0]
+    return None
+
+def retrato_checkpoint(tempo, posicao, tarefas_prontas, intervalos):
+    # Estado no início de uma iteração do laço de eventos. As instâncias são
+    # guardadas por (tarefa_id, execucao_id) e pelo quanto já executaram, então o
+    # retrato continua válido para um conjunto editado enquanto o escalonamento
+    # até 'tempo' não mudar. 'posicao' conta as instâncias já liberadas.
+    prontos = [(i.tarefa_id, i.execucao_id, i.tempo_restante)
+               for _, _, _, i in sorted(tarefas_prontas.heap, key=itemgetter(2))]
+    ultimo = None
+    if intervalos:
+        instancia, inicio, fim = intervalos[-1]
+        ultimo = (instancia.tarefa_id, instancia.execucao_id, inicio, fim)
+    return {'tempo': tempo, 'posicao': posicao, 'prontos': prontos,
+            'intervalos': len(intervalos), 'ultimo': ultimo}
+
+def escalonamento_lacunas(instancias, ocupados, tempo_total, tipo_analise, progresso=None):
+    # Simulação por eventos de 'instancias' só no tempo que sobra fora de
+    # 'ocupados', os intervalos [(instancia, inicio, fim)] das tarefas mais
+    # prioritárias, em ordem. Sob prioridade fixa dá o mesmo escalonamento que
+    # essas instâncias teriam numa simulação junto com as mais prioritárias.
+    # progresso(tempo, tempo_total): como em escalonamento_eventos.
+    intervalos = []
+    tarefas_prontas = FilaProntos(campo_prioridade(tipo_analise))
+    liberacoes = fluxo_liberacoes(instancias)
+    proxima = next(liberacoes, None)
+    inicios = [inicio for _, inicio, _ in ocupados]
+    fins = [fim for _, _, fim in ocupados]
+    tempo = 0
+    passos = 0
+    while tempo < tempo_total:
+        if progresso is not None:
+            passos += 1
+            if passos % PASSOS_PROGRESSO == 0:
+                progresso(tempo, tempo_total)
+
+        # Bloco ocupado que contém 'tempo' (busca binária: a fila pode ficar
+        # vazia por muitos blocos seguidos)
+        j = bisect_right(inicios, tempo) - 1
+        if j >= 0 and fins[j] > tempo:
+            tempo = fins[j]
+            continue
+
+        while proxima is not None and proxima.tempo_liberacao <= tempo:
+            if proxima.tempo_restante > 0:
+                tarefas_prontas.inserir(proxima)
+            proxima = next(liberacoes, None)
+
+        if not tarefas_prontas:
+            # Nada pronto: salta direto para a próxima liberação
+            if proxima is None:
+                break
+            tempo = proxima.tempo_liberacao
+            continue
+
+        proximo_evento = tempo_total
+        if proxima is not None:
+            proximo_evento = min(proxima.tempo_liberacao, proximo_evento)
+        if j + 1 < len(inicios):
+            proximo_evento = min(inicios[j + 1], proximo_evento)
+
+        tarefa_em_execucao = tarefas_prontas.topo()
+        fim = min(tempo + tarefa_em_execucao.tempo_restante, proximo_evento)
+        tarefa_em_execucao.tempo_restante -= fim - tempo
+
+        registrar_execucao(intervalos, tarefa_em_execucao, tempo, fim)
+
+        if tarefa_em_execucao.tempo_restante <= 0:
+            tarefas_prontas.remover_topo()
+        tempo = fim
+    return intervalos
+
+def instante_divergencia(anteriores, tarefas, resultado, tempo_total, tipo_analise):
+    # Primeiro instante em que o escalonamento anterior pode deixar de valer para
+    # o conjunto editado (mesmos períodos e prioridades):
+    # - C mudou: quando uma instância da tarefa atinge min(C antigo, C novo)
+    #   executado; até lá ela é indistinguível da antiga;
+    # - D mudou sob EDF: quando uma instância da tarefa está pronta junto com
+    #   outra cujo deadline fica entre o deadline antigo e o novo, pois a ordem
+    #   entre as duas pode inverter.
+    # Devolve tempo_total se nada muda no horizonte.
+    limite = tempo_total
+    minimo_c = {a.id: min(a.tempo_computacao, t.tempo_computacao)
+                for a, t in zip(anteriores, tarefas) if a.tempo_computacao != t.tempo_computacao}
+    delta_d = {}
+    if tipo_analise.lower() == "edf":
+        delta_d = {a.id: t.deadline - a.deadline for a, t in zip(anteriores, tarefas) if a.deadline != t.deadline}
+    if not minimo_c and not delta_d:
+        return limite
+    # Com C = 0 a instância nem entra na fila; com dois D mudando, a ordem entre
+    # elas pode inverter sem nenhum deadline cair no intervalo da outra
+    if 0 in minimo_c.values() or len(delta_d) > 1:
+        return 0
+
+    executado = {}
+    termino = {}
+    for instancia, inicio, fim in resultado['intervalos']:
+        termino[instancia] = fim
+        m = minimo_c.get(instancia.tarefa_id)
+        if m is not None:
+            antes = executado.get(instancia, 0)
+            if antes < m <= antes + fim - inicio:
+                limite = min(limite, inicio + m - antes)
+            executado[instancia] = antes + fim - inicio
+
+    if delta_d:
+        # Janela em que cada instância esteve pronta: [liberação, término)
+        def janela(instancia):
+            if instancia.tempo_restante > 0:
+                return tempo_total
+            return termino.get(instancia, instancia.tempo_liberacao)
+
+        (editada, delta), = delta_d.items()
+        outras = sorted((i.deadline_absoluto, i.tempo_liberacao, janela(i))
+                        for i in resultado['instancias'] if i.tarefa_id != editada)
+        deadlines = [d for d, _, _ in outras]
+        for instancia in resultado['instancias']:
+            if instancia.tarefa_id != editada or instancia.tempo_liberacao >= limite:
+                continue
+            liberacao, fim = instancia.tempo_liberacao, janela(instancia)
+            d = instancia.deadline_absoluto
+            for _, liberacao_x, fim_x in outras[bisect_left(deadlines, min(d, d + delta)):
+                                                bisect_right(deadlines, max(d, d + delta))]:
+                if liberacao_x < fim and liberacao < fim_x:
+                    limite = min(limite, max(liberacao, liberacao_x))
+    return limite
+
+def ressimular(tarefas, anteriores, resultado, tempo_total, tipo_analise="edf", progresso=None):
+    # Refaz o escalonamento depois de editar tarefas, reaproveitando o anterior.
+    # anteriores: congelar_tarefas() do conjunto simulado antes; resultado: dict
+    # com 'instancias', 'intervalos' e 'checkpoints' daquela simulação, com o
+    # mesmo tempo_total. Devolve um dict igual para o conjunto novo, com o mesmo
+    # escalonamento que uma simulação completa daria:
+    # - prioridade fixa: as tarefas acima do primeiro nível alterado mantêm seus
+    #   intervalos e só os níveis abaixo são simulados, nas lacunas delas;
+    # - senão, retoma do último checkpoint antes de instante_divergencia.
+    # Instâncias que não mudam são compartilhadas com 'resultado' (que não deve
+    # mais ser alterado). Mudar período ou número de tarefas refaz tudo.
+    checkpoints = []
+    if len(tarefas) != len(anteriores) or any(t.periodo != a.periodo for t, a in zip(tarefas, anteriores)):
+        instancias = gerar_instancias(tarefas, tempo_total)
+        intervalos = escalonamento_eventos(instancias, tempo_total, tipo_analise, progresso, checkpoints)
+        return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+    # Faixa de cada tarefa em 'instancias', geradas tarefa a tarefa
+    inicio_tarefa = [0]
+    for t in tarefas:
+        inicio_tarefa.append(inicio_tarefa[-1] + -(-tempo_total // t.periodo))
+
+    def montar(compartilhadas):
+        instancias = []
+        for tarefa_id, t in enumerate(tarefas):
+            if tarefa_id in compartilhadas:
+                instancias.extend(resultado['instancias'][inicio_tarefa[tarefa_id]:inicio_tarefa[tarefa_id + 1]])
+            else:
+                instancias.extend(nova_instancia(tarefa_id, t, k)
+                                  for k in range(inicio_tarefa[tarefa_id + 1] - inicio_tarefa[tarefa_id]))
+        return instancias
+
+    iguais = {a.id for a, t in zip(anteriores, tarefas)
+              if (a.nome, a.deadline, a.tempo_computacao, a.prioridade) == (t.nome, t.deadline, t.tempo_computacao, t.prioridade)}
+    prioridades_iguais = all(t.prioridade == a.prioridade for t, a in zip(tarefas, anteriores))
+
+    if tipo_analise.lower() != "edf":
+        # Níveis do topo sem nenhuma mudança não enxergam os de baixo
+        alta = set()
+        for a in sorted(anteriores, key=attrgetter('prioridade')):
+            if a.id not in iguais:
+                break
+            alta.add(a.id)
+
+        if alta:
+            instancias = montar(alta)
+            mantidos = [x for x in resultado['intervalos'] if x[0].tarefa_id in alta]
+            baixas = [i for i in instancias if i.tarefa_id not in alta]
+            simulados = escalonamento_lacunas(baixas, mantidos, tempo_total, tipo_analise, progresso)
+            intervalos = list(heapq.merge(mantidos, simulados, key=itemgetter(1)))
+            return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+    if not prioridades_iguais:
+        instancias = gerar_instancias(tarefas, tempo_total)
+        intervalos = escalonamento_eventos(instancias, tempo_total, tipo_analise, progresso, checkpoints)
+        return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+    # O que já executou é o mesmo até o limite: só o tempo restante muda com o C novo
+    delta_c = {a.id: t.tempo_computacao - a.tempo_computacao
+               for a, t in zip(anteriores, tarefas) if a.tempo_computacao != t.tempo_computacao}
+
+    def ajustar(checkpoint):
+        if not delta_c:
+            return checkpoint
+        prontos = [(tarefa_id, execucao_id, restante + delta_c.get(tarefa_id, 0))
+                   for tarefa_id, execucao_id, restante in checkpoint['prontos']]
+        return {**checkpoint, 'prontos': prontos}
+
+    limite = instante_divergencia(anteriores, tarefas, resultado, tempo_total, tipo_analise)
+    if limite >= tempo_total:
+        # Mesmo escalonamento: só as instâncias das tarefas editadas são trocadas
+        instancias = montar(iguais)
+        correspondente = {}
+        for antiga, instancia in zip(resultado['instancias'], instancias):
+            if antiga is not instancia:
+                instancia.tempo_restante = antiga.tempo_restante + delta_c.get(antiga.tarefa_id, 0)
+                correspondente[antiga] = instancia
+        intervalos = [x if x[0].tarefa_id in iguais else (correspondente[x[0]], x[1], x[2])
+                      for x in resultado['intervalos']]
+        checkpoints = [ajustar(c) for c in resultado['checkpoints']]
+        return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+    instancias = gerar_instancias(tarefas, tempo_total)
+    anteriores_cp = resultado['checkpoints']
+    k = bisect_left([c['tempo'] for c in anteriores_cp], limite) - 1
+    if k < 0:
+        intervalos = escalonamento_eventos(instancias, tempo_total, tipo_analise, progresso, checkpoints)
+        return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+    def nova(tarefa_id, execucao_id):
+        return instancias[inicio_tarefa[tarefa_id] + execucao_id - 1]
+
+    checkpoint = ajustar(anteriores_cp[k])
+    ordem = indice_liberacoes(instancias)
+    for instancia in ordem[:checkpoint['posicao']]:
+        instancia.tempo_restante = 0
+    prontos = []
+    for tarefa_id, execucao_id, restante in checkpoint['prontos']:
+        instancia = nova(tarefa_id, execucao_id)
+        instancia.tempo_restante = restante
+        prontos.append(instancia)
+    intervalos = [(nova(i.tarefa_id, i.execucao_id), inicio, fim)
+                  for i, inicio, fim in islice(resultado['intervalos'], checkpoint['intervalos'])]
+    if checkpoint['ultimo'] is not None:
+        tarefa_id, execucao_id, inicio, fim = checkpoint['ultimo']
+        intervalos[-1] = (nova(tarefa_id, execucao_id), inicio, fim)
+
+    checkpoints = [ajustar(c) for c in anteriores_cp[:k]] + [checkpoint]
+    intervalos = escalonamento_eventos(iter(ordem), tempo_total, tipo_analise, progresso, checkpoints,
+                                       (checkpoint['tempo'], checkpoint['posicao'], prontos, intervalos))
+    return {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+
+def perdas_de_deadline(instancias, intervalos, horizonte):
+    # Instâncias que perderam o deadline dentro do horizonte simulado: terminaram
+    # depois do deadline ou ainda tinham trabalho quando o deadline passou.
+    # Devolve [(instancia, fim)], com fim = None se não terminou no horizonte.
+    termino = {}
+    for intervalo in intervalos:
+        # Aceita também (instancia, inicio, fim, nucleo), de multiprocessador.py
+        termino[intervalo[0]] = intervalo[2]
+    perdas = []
+    for instancia in instancias:
+        if instancia.tempo_restante > 0:
+            if instancia.deadline_absoluto <= horizonte:
+                perdas.append((instancia, None))
+        elif termino.get(instancia, instancia.tempo_liberacao) > instancia.deadline_absoluto:
+            perdas.append((instancia, termino[instancia]))
+    return perdas
+
+def desnormalizar(instancias, intervalos, escala):
+    # Instâncias e intervalos simulados com tarefas.normalizar_tarefas levados
+    # de volta ao tempo real. São cópias: as normalizadas continuam valendo
+    # (checkpoints e ressimulação trabalham nelas). Aceita intervalos com núcleo.
+    if escala == 1:
+        return instancias, intervalos
+    reais = {}
+    for j in instancias:
+        reais[j] = Instancia(j.tarefa_id, j.nome_tarefa, j.tempo_liberacao * escala, j.deadline_absoluto * escala,
+                             j.tempo_restante * escala, j.execucao_id, j.prioridade)
+    intervalos = [(reais[intervalo[0]], intervalo[1] * escala, intervalo[2] * escala) + intervalo[3:]
+                  for intervalo in intervalos]
+    return list(reais.values()), intervalos
+
+def expandir_intervalos(intervalos, tempo_total):
+    # Visão por tick sob demanda: gera (tempo, instancia ou None) para cada ms
+    # a partir dos intervalos, sem materializar a lista inteira
+    tempo = 0
+    for instancia, inicio, fim in intervalos:
+        for t in range(tempo, inicio):
+            yield (t, None)
+        for t in range(inicio, fim):
+            yield (t, instancia)
+        tempo = fim
+    for t in range(tempo, tempo_total):
+        yield (t, None)
 
 def construir_intervalos(linha_do_tempo):
+    # Aceita lista ou gerador (por exemplo expandir_intervalos)
     intervalos = []
-    if not linha_do_tempo:
-        return intervalos
-    tarefa_atual = linha_do_tempo[0][1]
+    tarefa_atual = None
     inicio = 0
-    for i in range(1, len(linha_do_tempo)):
+    fim = 0
+    for _, instancia in linha_do_tempo:
         mudou = False
-        if (linha_do_tempo[i][1] is None and tarefa_atual is not None):
+        if (instancia is None and tarefa_atual is not None):
             mudou = True
-        elif (linha_do_tempo[i][1] is not None and tarefa_atual is None):
+        elif (instancia is not None and tarefa_atual is None):
             mudou = True
-        elif (linha_do_tempo[i][1] is not None and tarefa_atual is not None and
-              (linha_do_tempo[i][1]['nome_tarefa'] != tarefa_atual['nome_tarefa'] or
-               linha_do_tempo[i][1]['execucao_id'] != tarefa_atual['execucao_id'])):
+        elif (instancia is not None and tarefa_atual is not None and
+              (instancia.tarefa_id != tarefa_atual.tarefa_id or
+               instancia.execucao_id != tarefa_atual.execucao_id)):
             mudou = True
 
         if mudou:
             if tarefa_atual is not None:
-                intervalos.append((tarefa_atual, inicio, i))
-            tarefa_atual = linha_do_tempo[i][1]
-            inicio = i
+                intervalos.append((tarefa_atual, inicio, fim))
+            tarefa_atual = instancia
+            inicio = fim
+        fim += 1
 
     if tarefa_atual is not None:
-        intervalos.append((tarefa_atual, inicio, len(linha_do_tempo)))
+        intervalos.append((tarefa_atual, inicio, fim))
     return intervalos
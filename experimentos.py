@@ -0,0 +1,104 @@
+# Experimento de taxa de escalonabilidade x utilização para EDF, DM, RM e OPA
+# (prioridade fixa ótima de Audsley).
+# Varre a utilização, gera conjuntos aleatórios reprodutíveis (gerador.py) e
+# decide cada um com verificar_escalonabilidade de analise.py (limites baratos
+# antes dos testes exatos QPA/RTA), em paralelo num pool de processos.
+# Grava as curvas agregadas em CSV.
+#
+# Uso: python experimentos.py -n 10 --conjuntos 2000 --u-min 0.5 --u-max 1.0 --passo 0.025 -o curvas.csv
+import argparse
+import csv
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from escalonadores import atribuir_prioridades_dm, atribuir_prioridades_rm
+from analise import verificar_escalonabilidade, atribuir_prioridades_opa
+from gerador import gerar_conjuntos
+
+ALGORITMOS = ("edf", "dm", "rm", "opa")
+
+def avaliar_bloco(bloco):
+    # Roda em um processo do pool: um bloco de conjuntos de um mesmo ponto de utilização
+    indice, utilizacao, semente, quantidade, n, opcoes = bloco
+    conjuntos = gerar_conjuntos(quantidade, n, utilizacao, semente, **opcoes)
+    contagem = dict.fromkeys(ALGORITMOS, 0)
+    for tarefas in conjuntos:
+        if verificar_escalonabilidade(tarefas, "edf")['escalonavel']:
+            contagem['edf'] += 1
+        atribuir_prioridades_dm(tarefas)
+        if verificar_escalonabilidade(tarefas, "dm")['escalonavel']:
+            contagem['dm'] += 1
+        atribuir_prioridades_rm(tarefas)
+        if verificar_escalonabilidade(tarefas, "rm")['escalonavel']:
+            contagem['rm'] += 1
+        # A própria atribuição já diz se alguma ordem fixa serve
+        if atribuir_prioridades_opa(tarefas):
+            contagem['opa'] += 1
+    return indice, quantidade, contagem
+
+def pontos_utilizacao(u_min, u_max, passo):
+    quantidade = int(round((u_max - u_min) / passo)) + 1
+    return [round(u_min + i * passo, 10) for i in range(quantidade)]
+
+def executar_experimento(utilizacoes, conjuntos, n, semente=0, processos=None, tamanho_bloco=250, **opcoes):
+    # Cada bloco tem semente própria derivada de (semente, ponto, bloco): o
+    # resultado não depende do número de processos nem da ordem de execução
+    blocos = []
+    for i, u in enumerate(utilizacoes):
+        for b, inicio in enumerate(range(0, conjuntos, tamanho_bloco)):
+            quantidade = min(tamanho_bloco, conjuntos - inicio)
+            blocos.append((i, u, f"{semente}:{i}:{b}", quantidade, n, opcoes))
+
+    totais = [0] * len(utilizacoes)
+    escalonaveis = [dict.fromkeys(ALGORITMOS, 0) for _ in utilizacoes]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for indice, quantidade, contagem in pool.map(avaliar_bloco, blocos):
+            totais[indice] += quantidade
+            for a in ALGORITMOS:
+                escalonaveis[indice][a] += contagem[a]
+
+    return [{'utilizacao': u, 'conjuntos': totais[i],
+             **{a: escalonaveis[i][a] / totais[i] for a in ALGORITMOS}}
+            for i, u in enumerate(utilizacoes)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Taxa de escalonabilidade x utilização (EDF, DM, RM, OPA)")
+    parser.add_argument("-n", "--tarefas", type=int, default=10, help="tarefas por conjunto")
+    parser.add_argument("--conjuntos", type=int, default=1000, help="conjuntos por ponto de utilização")
+    parser.add_argument("--u-min", type=float, default=0.05)
+    parser.add_argument("--u-max", type=float, default=1.0)
+    parser.add_argument("--passo", type=float, default=0.05)
+    parser.add_argument("--distribuicao", choices=["log-uniforme", "harmonica"], default="log-uniforme")
+    parser.add_argument("--periodo-min", type=int, default=10)
+    parser.add_argument("--periodo-max", type=int, default=1000)
+    parser.add_argument("--deadline-min", type=float, default=1.0, help="menor r em D = C + r*(T - C)")
+    parser.add_argument("--deadline-max", type=float, default=1.0, help="maior r em D = C + r*(T - C)")
+    parser.add_argument("--metodo", choices=["uunifast", "randfixedsum"], default="uunifast")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("-p", "--processos", type=int, default=None)
+    parser.add_argument("-o", "--saida", default="-", help="CSV de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    utilizacoes = pontos_utilizacao(args.u_min, args.u_max, args.passo)
+    inicio = time.perf_counter()
+    curvas = executar_experimento(
+        utilizacoes, args.conjuntos, args.tarefas, args.semente, args.processos,
+        distribuicao=args.distribuicao, periodo_min=args.periodo_min, periodo_max=args.periodo_max,
+        razao_deadline=(args.deadline_min, args.deadline_max), metodo=args.metodo)
+    segundos = time.perf_counter() - inicio
+
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.DictWriter(saida, fieldnames=["utilizacao", "conjuntos", *ALGORITMOS])
+        escritor.writeheader()
+        escritor.writerows(curvas)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+    total = len(utilizacoes) * args.conjuntos
+    print(f"{total} conjuntos em {segundos:.1f} s ({total / segundos * 60:.0f} conjuntos/min)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Geração aleatória e reprodutível de conjuntos de tarefas (Tarefa) com
+# utilização controlada, para experimentos de taxa de escalonabilidade.
+import math
+import random
+
+from tarefas import Tarefa
+
+def uunifast(n, utilizacao, rng):
+    # UUniFast (Bini & Buttazzo): n utilizações uniformes no simplex com soma
+    # 'utilizacao'. Só garante ui <= 1 se utilizacao <= 1.
+    utilizacoes = []
+    soma = utilizacao
+    for i in range(1, n):
+        proxima = soma * rng.random() ** (1 / (n - i))
+        utilizacoes.append(soma - proxima)
+        soma = proxima
+    utilizacoes.append(soma)
+    return utilizacoes
+
+def randfixedsum(n, utilizacao, rng):
+    # Randfixedsum (Stafford; versão de Emberson, Stafford & Davis): n
+    # utilizações em [0, 1] com soma 'utilizacao' (0 <= utilizacao <= n),
+    # uniformes sobre a região válida. Serve também para U > 1 (multiprocessador).
+    if n == 1:
+        return [utilizacao]
+    k = min(max(math.floor(utilizacao), 0), n - 1)
+    s1 = [utilizacao - (k - i) for i in range(n)]
+    s2 = [(k + n - i) - utilizacao for i in range(n)]
+
+    # Tabela de probabilidades de transição entre os simplexos
+    muito_pequeno = 2.2250738585072014e-308
+    w = [[0.0] * (n + 1) for _ in range(n)]
+    w[0][1] = 1.7976931348623157e+308
+    t = [[0.0] * n for _ in range(n - 1)]
+    for i in range(2, n + 1):
+        for c in range(i):
+            tmp1 = w[i - 2][c + 1] * s1[c] / i
+            tmp2 = w[i - 2][c] * s2[n - i + c] / i
+            w[i - 1][c + 1] = tmp1 + tmp2
+            tmp3 = w[i - 1][c + 1] + muito_pequeno
+            if s2[n - i + c] > s1[c]:
+                t[i - 2][c] = tmp2 / tmp3
+            else:
+                t[i - 2][c] = 1 - tmp1 / tmp3
+
+    x = [0.0] * n
+    s = utilizacao
+    j = k + 1
+    sm = 0.0
+    pr = 1.0
+    for i in range(n - 1, 0, -1):
+        e = 1 if rng.random() <= t[i - 1][j - 1] else 0
+        sx = rng.random() ** (1 / i)
+        sm += (1 - sx) * pr * s / (i + 1)
+        pr *= sx
+        x[n - i - 1] = sm + pr * e
+        s -= e
+        j -= e
+    x[n - 1] = sm + pr * s
+    rng.shuffle(x)
+    return x
+
+def periodos_log_uniforme(n, periodo_min, periodo_max, rng, granularidade=1):
+    # Distribuição log-uniforme em [periodo_min, periodo_max], arredondada para
+    # múltiplos de 'granularidade' (granularidade maior = hiperperíodo menor)
+    periodos = []
+    for _ in range(n):
+        p = math.exp(rng.uniform(math.log(periodo_min), math.log(periodo_max + granularidade)))
+        periodos.append(max(granularidade, int(p // granularidade) * granularidade))
+    return periodos
+
+def periodos_harmonicos(n, periodo_min, periodo_max, rng):
+    # Períodos periodo_min * 2^k: todos dividem uns aos outros, então o
+    # hiperperíodo é o maior período
+    k_max = max(0, int(math.log2(periodo_max / periodo_min)))
+    return [periodo_min * 2 ** rng.randint(0, k_max) for _ in range(n)]
+
+def gerar_conjunto(n, utilizacao, rng, distribuicao="log-uniforme", periodo_min=10, periodo_max=1000,
+                   razao_deadline=(1.0, 1.0), metodo="uunifast"):
+    # Conjunto de n tarefas com utilização total ~'utilizacao' (o arredondamento
+    # dos Ci para inteiros muda um pouco a utilização real).
+    # Deadline: D = C + r*(T - C), com r sorteado em razao_deadline; (1, 1) dá D = T.
+    if metodo == "uunifast":
+        utilizacoes = uunifast(n, utilizacao, rng)
+    elif metodo == "randfixedsum":
+        utilizacoes = randfixedsum(n, utilizacao, rng)
+    else:
+        raise ValueError(f"Método de geração desconhecido: {metodo}")
+
+    if distribuicao == "log-uniforme":
+        periodos = periodos_log_uniforme(n, periodo_min, periodo_max, rng)
+    elif distribuicao == "harmonica":
+        periodos = periodos_harmonicos(n, periodo_min, periodo_max, rng)
+    else:
+        raise ValueError(f"Distribuição de períodos desconhecida: {distribuicao}")
+
+    tarefas = []
+    for i, (u, periodo) in enumerate(zip(utilizacoes, periodos)):
+        c = min(periodo, max(1, round(u * periodo)))
+        r = rng.uniform(*razao_deadline)
+        deadline = max(c, min(periodo, round(c + r * (periodo - c))))
+        tarefas.append(Tarefa(f"tarefa{i + 1}", periodo, deadline, c))
+    return tarefas
+
+def gerar_conjuntos(quantidade, n, utilizacao, semente, **opcoes):
+    # Sequência reprodutível: a mesma semente gera sempre os mesmos conjuntos
+    rng = random.Random(semente)
+    return [gerar_conjunto(n, utilizacao, rng, **opcoes) for _ in range(quantidade)]
@@ -0,0 +1,109 @@
+# Instrumentação por fase (MMC, geração de instâncias, simulação, métricas,
+# figura, desenho no canvas): tempo de parede, saldo de blocos alocados e,
+# opcionalmente, pico de memória (tracemalloc) e perfil cProfile.
+#
+# Uso:
+#     instrumentacao = Instrumentacao(ativa=True)
+#     with instrumentacao.medir("simulação"):
+#         ...
+#     instrumentacao.fases     -> [{'fase', 'tempo_s', 'blocos', 'pico_bytes'}]
+# Desligada, medir() devolve sempre o mesmo contexto vazio: nada é medido.
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+
+NADA = contextlib.nullcontext()
+
+class Instrumentacao:
+    def __init__(self, ativa=True, memoria=False, perfil=False):
+        # memoria: pico por fase com tracemalloc (deixa a execução bem mais lenta)
+        # perfil: cProfile das fases mais externas (as internas já entram nele)
+        self.ativa = ativa
+        self.memoria = ativa and memoria
+        self.perfil = ativa and perfil
+        self.fases = []
+        self.perfis = {}
+        self.pilha = []
+        # tracemalloc ligado por esta instrumentação (e não por quem a chamou)
+        self.rastreando = False
+
+    def medir(self, nome):
+        if not self.ativa:
+            return NADA
+        return MedicaoFase(self, nome)
+
+    def resumo(self):
+        # Linha curta para a barra de status da interface
+        partes = []
+        for f in self.fases:
+            texto = f"{f['fase']} {f['tempo_s'] * 1000:.0f} ms"
+            if f['pico_bytes'] is not None:
+                texto += f" ({f['pico_bytes'] / 2**20:.1f} MiB)"
+            partes.append(texto)
+        return " | ".join(partes)
+
+    def relatorio_perfil(self, nome, linhas=20):
+        # Funções com maior tempo acumulado no perfil da fase 'nome'
+        saida = io.StringIO()
+        pstats.Stats(self.perfis[nome], stream=saida).sort_stats("cumulative").print_stats(linhas)
+        return saida.getvalue()
+
+class MedicaoFase:
+    def __init__(self, instrumentacao, nome):
+        self.instrumentacao = instrumentacao
+        self.nome = nome
+        self.perfil = None
+
+    def __enter__(self):
+        instrumentacao = self.instrumentacao
+        if instrumentacao.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                instrumentacao.rastreando = True
+            atual, pico = tracemalloc.get_traced_memory()
+            # O pico é global: guarda o da fase de fora antes de zerá-lo para esta
+            if instrumentacao.pilha:
+                pai = instrumentacao.pilha[-1]
+                pai.pico = max(pai.pico, pico)
+            tracemalloc.reset_peak()
+            self.memoria_inicial = atual
+            self.pico = atual
+        if instrumentacao.perfil and not instrumentacao.pilha:
+            self.perfil = cProfile.Profile()
+        instrumentacao.pilha.append(self)
+        # Entra na lista na ordem de início: a fase de fora antes das internas
+        self.registro = {'fase': self.nome, 'tempo_s': None, 'blocos': None, 'pico_bytes': None}
+        instrumentacao.fases.append(self.registro)
+        self.blocos = sys.getallocatedblocks()
+        self.inicio = time.perf_counter()
+        if self.perfil is not None:
+            self.perfil.enable()
+        return self
+
+    def __exit__(self, *erro):
+        if self.perfil is not None:
+            self.perfil.disable()
+        tempo = time.perf_counter() - self.inicio
+        blocos = sys.getallocatedblocks() - self.blocos
+        instrumentacao = self.instrumentacao
+        instrumentacao.pilha.pop()
+        pico = None
+        if instrumentacao.memoria:
+            pico = max(self.pico, tracemalloc.get_traced_memory()[1]) - self.memoria_inicial
+            if instrumentacao.pilha:
+                pai = instrumentacao.pilha[-1]
+                pai.pico = max(pai.pico, self.memoria_inicial + pico)
+            elif instrumentacao.rastreando:
+                tracemalloc.stop()
+                instrumentacao.rastreando = False
+        if self.perfil is not None:
+            instrumentacao.perfis[self.nome] = self.perfil
+        self.registro.update(tempo_s=tempo, blocos=blocos, pico_bytes=pico)
+        return False
+
+# Instância padrão para quem não pediu instrumentação
+DESLIGADA = Instrumentacao(ativa=False)
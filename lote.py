@@ -0,0 +1,276 @@
+# Execução em lote, sem interface gráfica (não importa Tk nem matplotlib).
+# Lê conjuntos de tarefas de arquivos JSON/CSV, simula EDF/DM/RM/OPA em paralelo
+# num pool de processos e grava um resultado por linha em JSON Lines.
+#
+# Formatos de entrada:
+# - JSON: lista de conjuntos; cada conjunto é {"nome": ..., "tarefas": [...]}
+#   ou direto a lista de tarefas. Cada tarefa é
+#   {"nome", "periodo", "deadline", "tempo_computacao"} ou [nome, periodo, deadline, C].
+# - CSV: cabeçalho conjunto,nome,periodo,deadline,tempo_computacao; as linhas
+#   com o mesmo 'conjunto' formam um conjunto.
+#
+# Um conjunto malformado (campo faltando, valor inválido, período zero) sai como
+# uma linha {"conjunto", "algoritmo", "erro"} e o lote continua.
+#
+# Uso: python lote.py conjuntos.json outros.csv -a edf,dm,rm -p 8 -o resultados.jsonl
+# Com --cache DIR, conjuntos já avaliados (mesmas tarefas, algoritmo e horizonte)
+# são lidos do diretório em vez de simulados de novo. Com --primeira-perda, cada
+# simulação para na primeira perda de deadline (triagem de escalonabilidade).
+# Com --analitico, nada é simulado: o veredito vem dos testes de analise.py
+# (limites, depois QPA/RTA) e o registro diz qual nível decidiu.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+from tarefas import Tarefa, calcular_mmc_lista, normalizar_tarefas
+from escalonadores import (atribuir_prioridades_dm, atribuir_prioridades_rm, gerar_instancias,
+                           escalonamento_eventos, desnormalizar)
+from analise import horizonte_verificacao, verificar_escalonabilidade, atribuir_prioridades_opa
+from cache import CacheSimulacao, chave_simulacao
+from metricas import metricas_instancias, metricas_por_tarefa
+from instrumentacao import Instrumentacao, DESLIGADA
+
+# Um cache por diretório em cada processo do pool
+CACHES = {}
+
+def tarefa_de_json(dados, i):
+    if isinstance(dados, dict):
+        return (str(dados.get('nome', f"tarefa{i + 1}")), int(dados['periodo']),
+                int(dados['deadline']), int(dados['tempo_computacao']))
+    nome, periodo, deadline, c = dados
+    return (str(nome), int(periodo), int(deadline), int(c))
+
+def descrever_erro(erro):
+    return f"{type(erro).__name__}: {erro}"
+
+def ler_json(caminho):
+    # Gera (nome, dados, erro): um conjunto malformado vira um erro só dele
+    base = os.path.basename(caminho)
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+    except (OSError, ValueError) as erro:
+        yield base, None, descrever_erro(erro)
+        return
+    if isinstance(dados, dict):
+        dados = [dados]
+    for k, conjunto in enumerate(dados):
+        nome = f"{base}#{k + 1}"
+        try:
+            if isinstance(conjunto, dict):
+                nome = str(conjunto.get('nome', nome))
+                tarefas = conjunto['tarefas']
+            else:
+                tarefas = conjunto
+            yield nome, [tarefa_de_json(t, i) for i, t in enumerate(tarefas)], None
+        except (KeyError, ValueError, TypeError) as erro:
+            yield nome, None, descrever_erro(erro)
+
+def ler_csv(caminho):
+    conjuntos = {}
+    erros = {}
+    try:
+        with open(caminho, newline="", encoding="utf-8") as f:
+            leitor = csv.DictReader(f)
+            for linha in leitor:
+                nome = linha.get('conjunto') or os.path.basename(caminho)
+                tarefas = conjuntos.setdefault(nome, [])
+                try:
+                    tarefas.append((linha.get('nome') or f"tarefa{len(tarefas) + 1}", int(linha['periodo']),
+                                    int(linha['deadline']), int(linha['tempo_computacao'])))
+                except (KeyError, ValueError, TypeError) as erro:
+                    # Vale o primeiro erro do conjunto; as outras linhas dele são descartadas
+                    erros.setdefault(nome, f"linha {leitor.line_num}: {descrever_erro(erro)}")
+    except (OSError, csv.Error) as erro:
+        yield os.path.basename(caminho), None, descrever_erro(erro)
+        return
+    for nome, tarefas in conjuntos.items():
+        yield (nome, None, erros[nome]) if nome in erros else (nome, tarefas, None)
+
+def ler_conjuntos(caminhos):
+    for caminho in caminhos:
+        if caminho.lower().endswith(".csv"):
+            yield from ler_csv(caminho)
+        else:
+            yield from ler_json(caminho)
+
+def avaliar(trabalho):
+    # Roda em um processo do pool: um conjunto de tarefas sob um algoritmo. Um
+    # conjunto que não dá para ler ou avaliar (ex.: período zero) vira uma linha
+    # {'conjunto', 'algoritmo', 'erro'} em vez de derrubar o lote
+    nome_conjunto, tipo, erro = trabalho[0], trabalho[2], trabalho[-1]
+    if erro is None:
+        try:
+            return avaliar_conjunto(*trabalho[:-1])
+        except Exception as e:
+            erro = descrever_erro(e)
+    return {'conjunto': nome_conjunto, 'algoritmo': tipo, 'erro': erro}
+
+def avaliar_conjunto(nome_conjunto, dados, tipo, modo_horizonte, diretorio_cache, opcoes_instrumentacao,
+                     parar_na_perda, analitico):
+    inicio = time.perf_counter()
+    tarefas = [Tarefa(*t) for t in dados]
+    instrumentacao = Instrumentacao(**opcoes_instrumentacao) if opcoes_instrumentacao else DESLIGADA
+    medir = instrumentacao.medir
+
+    if analitico:
+        # Sem traço pedido, não há o que simular; os testes são baratos demais para o cache
+        with medir("prioridades"):
+            if tipo == "dm":
+                atribuir_prioridades_dm(tarefas)
+            elif tipo == "rm":
+                atribuir_prioridades_rm(tarefas)
+            elif tipo == "opa":
+                atribuir_prioridades_opa(tarefas)
+        with medir("análise"):
+            verificacao = verificar_escalonabilidade(tarefas, tipo)
+        registro = {
+            'conjunto': nome_conjunto,
+            'algoritmo': tipo,
+            'escalonavel': verificacao['escalonavel'],
+            'nivel': verificacao['nivel'],
+            'teste': verificacao['teste'],
+            'niveis': verificacao['niveis'],
+            'utilizacao': verificacao['utilizacao'],
+            'tempo_s': time.perf_counter() - inicio,
+        }
+        return anexar_instrumentacao(registro, instrumentacao)
+
+    cache = None
+    if diretorio_cache is not None:
+        if diretorio_cache not in CACHES:
+            CACHES[diretorio_cache] = CacheSimulacao(capacidade=256, diretorio=diretorio_cache)
+        cache = CACHES[diretorio_cache]
+        # versao: registros gravados antes das métricas por tarefa e da escala não servem mais
+        chave = chave_simulacao(tarefas, tipo, modo_horizonte, resultado="lote", versao=3,
+                                **({'parar_na_perda': True} if parar_na_perda else {}))
+        with medir("cache"):
+            registro = cache.obter(chave)
+        if registro is not None:
+            return anexar_instrumentacao({**registro, 'conjunto': nome_conjunto,
+                                          'tempo_s': time.perf_counter() - inicio}, instrumentacao)
+
+    with medir("prioridades"):
+        if tipo == "dm":
+            atribuir_prioridades_dm(tarefas)
+        elif tipo == "rm":
+            atribuir_prioridades_rm(tarefas)
+        elif tipo == "opa":
+            atribuir_prioridades_opa(tarefas)
+
+    # Simulação em unidades de mdc(P, D, C) ms (normalizar_tarefas); tempos voltam para ms
+    normalizadas, escala = normalizar_tarefas(tarefas)
+    with medir("horizonte"):
+        if modo_horizonte == "verificacao":
+            horizonte = horizonte_verificacao(normalizadas, tipo)
+        else:
+            hiper_periodo = calcular_mmc_lista([t.periodo for t in normalizadas])
+            horizonte = {'horizonte': hiper_periodo, 'criterio': "hiperperíodo", 'hiper_periodo': hiper_periodo}
+
+    with medir("instâncias"):
+        instancias = gerar_instancias(normalizadas, horizonte['horizonte'])
+    simulado = horizonte['horizonte']
+    primeira_perda = None
+    with medir("simulação"):
+        if parar_na_perda:
+            # Triagem: para na primeira perda; as métricas valem só até esse instante
+            intervalos, perda = escalonamento_eventos(instancias, simulado, tipo, parar_na_perda=True)
+            if perda is not None:
+                instancia, simulado = perda
+                primeira_perda = {'tarefa': instancia.nome_tarefa, 'execucao': instancia.execucao_id,
+                                  'tempo': simulado * escala}
+        else:
+            intervalos = escalonamento_eventos(instancias, simulado, tipo)
+    with medir("desnormalização"):
+        instancias, intervalos = desnormalizar(instancias, intervalos, escala)
+        simulado *= escala
+    with medir("métricas"):
+        metricas = metricas_instancias(instancias, intervalos, simulado)
+        por_tarefa = metricas_por_tarefa(tarefas, metricas)
+    perdas = int(metricas['perdida'].sum())
+    # Exata: em float, U = 1 pode virar 1.0000000000000002
+    utilizacao = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+
+    registro = {
+        'conjunto': nome_conjunto,
+        'algoritmo': tipo,
+        'escalonavel': not perdas and utilizacao <= 1,
+        'perdas': perdas,
+        'tempo_resposta_max': {m['nome']: int(m['resposta_max']) for m in por_tarefa if m['resposta_max'] is not None},
+        'metricas': por_tarefa,
+        'utilizacao': float(utilizacao),
+        'horizonte': horizonte['horizonte'] * escala,
+        'criterio_horizonte': horizonte['criterio'],
+        'escala': escala,
+        'tempo_s': time.perf_counter() - inicio,
+    }
+    if parar_na_perda:
+        registro['simulado_ate'] = simulado
+        registro['primeira_perda'] = primeira_perda
+    if cache is not None:
+        cache.guardar(chave, registro)
+    return anexar_instrumentacao(registro, instrumentacao)
+
+def anexar_instrumentacao(registro, instrumentacao):
+    # Fases medidas (e perfis cProfile, se pedidos) vão no registro, nunca no cache
+    if not instrumentacao.ativa:
+        return registro
+    registro = {**registro, 'fases': instrumentacao.fases}
+    if instrumentacao.perfil:
+        registro['perfil'] = {nome: instrumentacao.relatorio_perfil(nome) for nome in instrumentacao.perfis}
+    return registro
+
+def executar_lote(caminhos, algoritmos, processos=None, saida=sys.stdout, modo_horizonte="hiperperiodo",
+                  diretorio_cache=None, instrumentacao=None, parar_na_perda=False, analitico=False):
+    # instrumentacao: None ou as opções de Instrumentacao (ex.: {'memoria': True, 'perfil': False})
+    # parar_na_perda: triagem, cada simulação para na primeira perda de deadline
+    # analitico: só os testes analíticos, sem simular
+    trabalhos = ((nome, dados, tipo, modo_horizonte, diretorio_cache, instrumentacao, parar_na_perda, analitico, erro)
+                 for nome, dados, erro in ler_conjuntos(caminhos) for tipo in algoritmos)
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        # map devolve na ordem de entrada, conforme cada resultado fica pronto
+        for resultado in pool.map(avaliar, trabalhos, chunksize=8):
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            saida.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação de escalonamento em lote (sem interface gráfica)")
+    parser.add_argument("arquivos", nargs="+", help="arquivos .json ou .csv com conjuntos de tarefas")
+    parser.add_argument("-a", "--algoritmos", default="edf,dm,rm", help="lista separada por vírgula: edf, dm, rm, opa (padrão: edf,dm,rm)")
+    parser.add_argument("-p", "--processos", type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument("-o", "--saida", default="-", help="arquivo JSON Lines de saída (padrão: stdout)")
+    parser.add_argument("--horizonte", choices=["hiperperiodo", "verificacao"], default="hiperperiodo",
+                        help="simular o hiperperíodo inteiro ou só o horizonte de verificação")
+    parser.add_argument("--cache", default=None, help="diretório de cache de resultados entre execuções")
+    parser.add_argument("--primeira-perda", action="store_true",
+                        help="triagem: parar cada simulação na primeira perda de deadline")
+    parser.add_argument("--analitico", action="store_true",
+                        help="não simular: decidir pelos testes analíticos (limites, QPA/RTA)")
+    parser.add_argument("--instrumentar", action="store_true", help="tempo e blocos alocados por fase em cada resultado")
+    parser.add_argument("--memoria", action="store_true", help="com --instrumentar, pico de memória por fase (tracemalloc)")
+    parser.add_argument("--perfil", action="store_true", help="com --instrumentar, perfil cProfile de cada fase")
+    args = parser.parse_args(argv)
+    instrumentacao = None
+    if args.instrumentar:
+        instrumentacao = {'memoria': args.memoria, 'perfil': args.perfil}
+
+    algoritmos = [a.strip().lower() for a in args.algoritmos.split(",") if a.strip()]
+    for a in algoritmos:
+        if a not in ("edf", "dm", "rm", "opa"):
+            parser.error(f"algoritmo desconhecido: {a}")
+
+    if args.saida == "-":
+        executar_lote(args.arquivos, algoritmos, args.processos, sys.stdout, args.horizonte, args.cache,
+                      instrumentacao, args.primeira_perda, args.analitico)
+    else:
+        with open(args.saida, "w", encoding="utf-8") as saida:
+            executar_lote(args.arquivos, algoritmos, args.processos, saida, args.horizonte, args.cache,
+                          instrumentacao, args.primeira_perda, args.analitico)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 # Lucas Ribeiro Nunes 1.0
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from tarefas import Tarefa, calcular_mmc_lista
+from tarefas import Tarefa, calcular_mmc_lista, congelar_tarefas, normalizar_tarefas
 from escalonadores import (atribuir_prioridades_dm, atribuir_prioridades_rm, gerar_instancias,
-                           escalonamento_edf, escalonamento_dm, escalonamento_rm)
+                           escalonamento_eventos, ressimular, desnormalizar, SimulacaoCancelada)
+from analise import verificar_escalonabilidade, horizonte_verificacao, atribuir_prioridades_opa
 from plotagem import plotar_simulacao
+from cache import CacheSimulacao, chave_simulacao
+from metricas import metricas_instancias, metricas_por_tarefa
+from traco import EscritorTraco, LeitorTraco
+from instrumentacao import Instrumentacao, DESLIGADA
+from multiprocessador import (escalonamento_global, particionar, escalonamento_particionado,
+                              nucleos_necessarios)
 
 class EditorTarefas(tk.Toplevel):
     def __init__(self, master, tarefas):
@@ -69,7 +78,8 @@ class EditorTarefas(tk.Toplevel):
             "Escolha um algoritmo de escalonamento:\n"
             "- EDF: Prioridade pelo deadline mais próximo.\n"
             "- DM: Prioridade fixa pelo menor deadline relativo.\n"
-            "- RM: Prioridade fixa pelo menor período (deadline não interfere em RM).\n\n"
+            "- RM: Prioridade fixa pelo menor período (deadline não interfere em RM).\n"
+            "- OPA: Prioridade fixa pela atribuição ótima de Audsley (acha uma ordem viável, se existir).\n\n"
             "Após ajustar as tarefas (adicionar/editar/remover) e escolher o algoritmo na janela principal, clique em Executar."
         )
 
@@ -188,6 +198,38 @@ class EditorTarefas(tk.Toplevel):
             self.tarefas.append(Tarefa(vals[0], int(vals[1]), int(vals[2]), int(vals[3])))
         self.destroy()
 
+class JanelaMetricas(tk.Toplevel):
+    # Tabela com os agregados por tarefa de metricas_por_tarefa (tempos em ms)
+    COLUNAS = [("nome", "Tarefa"), ("resposta_max", "R máx"), ("resposta_media", "R médio"),
+               ("resposta_p99", "R p99"), ("jitter_saida", "Jitter saída"), ("latencia_max", "Latência máx"),
+               ("jitter_inicio", "Jitter início"), ("preempcoes", "Preempções"), ("perdas", "Perdas"),
+               ("atraso_max", "Atraso máx")]
+
+    def __init__(self, master, metricas):
+        super().__init__(master)
+        self.title("Métricas por Tarefa")
+        self.configure(bg="#1E1E1E")
+
+        style = ttk.Style(self)
+        style.configure("Treeview", background="#252526", foreground="#EEE", fieldbackground="#252526", rowheight=30)
+        style.configure("Treeview.Heading", background="#3A3D41", foreground="#EEE")
+
+        tree = ttk.Treeview(self, columns=[c for c, _ in self.COLUNAS], show="headings", height=min(len(metricas), 20))
+        for coluna, titulo in self.COLUNAS:
+            tree.heading(coluna, text=titulo)
+            tree.column(coluna, width=140 if coluna == "nome" else 110, anchor="w" if coluna == "nome" else "e")
+        for registro in metricas:
+            tree.insert("", tk.END, values=[self.formatar(registro[c]) for c, _ in self.COLUNAS])
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    @staticmethod
+    def formatar(valor):
+        if valor is None:
+            return "-"
+        if isinstance(valor, float):
+            return f"{valor:.0f}" if valor.is_integer() else f"{valor:.2f}"
+        return str(valor)
+
 class App:
     def __init__(self, master):
         self.master = master
@@ -224,46 +266,332 @@ class App:
 
         tk.Label(top_frame, text="Tipo de Análise:", bg=bg_color, fg=fg_color).pack(side=tk.LEFT, padx=5)
         self.tipo_analise_var = tk.StringVar(value="EDF")
-        tipo_combobox = ttk.Combobox(top_frame, textvariable=self.tipo_analise_var, values=["EDF", "DM", "RM"], width=5)
+        tipo_combobox = ttk.Combobox(top_frame, textvariable=self.tipo_analise_var, values=["EDF", "DM", "RM", "OPA"], width=5)
         tipo_combobox.pack(side=tk.LEFT, padx=5)
 
-        tk.Button(top_frame, text="Editar Tarefas", command=self.abrir_editor_tarefas, bg="#3A3D41", fg=fg_color).pack(side=tk.LEFT, padx=10)
-        tk.Button(top_frame, text="Executar", command=self.executar, bg="#3A3D41", fg=fg_color).pack(side=tk.LEFT, padx=10)
+        # Hiperperíodo completo ou só o horizonte que basta para o veredito
+        tk.Label(top_frame, text="Horizonte:", bg=bg_color, fg=fg_color).pack(side=tk.LEFT, padx=5)
+        self.horizonte_var = tk.StringVar(value="Hiperperíodo")
+        horizonte_combobox = ttk.Combobox(top_frame, textvariable=self.horizonte_var, values=["Hiperperíodo", "Verificação"], width=12)
+        horizonte_combobox.pack(side=tk.LEFT, padx=5)
+
+        # Número de núcleos e, com mais de um, escalonamento global ou particionado (bin-packing)
+        tk.Label(top_frame, text="Núcleos:", bg=bg_color, fg=fg_color).pack(side=tk.LEFT, padx=5)
+        self.nucleos_var = tk.IntVar(value=1)
+        tk.Spinbox(top_frame, from_=1, to=16, textvariable=self.nucleos_var, width=3,
+                   bg="#252526", fg=fg_color).pack(side=tk.LEFT, padx=5)
+        tk.Label(top_frame, text="Estratégia:", bg=bg_color, fg=fg_color).pack(side=tk.LEFT, padx=5)
+        self.estrategia_var = tk.StringVar(value="Global")
+        estrategia_combobox = ttk.Combobox(top_frame, textvariable=self.estrategia_var, values=["Global", "FFD", "BFD", "WFD"], width=7)
+        estrategia_combobox.pack(side=tk.LEFT, padx=5)
 
+        tk.Button(top_frame, text="Editar Tarefas", command=self.abrir_editor_tarefas, bg="#3A3D41", fg=fg_color).pack(side=tk.LEFT, padx=10)
+        self.botao_executar = tk.Button(top_frame, text="Executar", command=self.executar, bg="#3A3D41", fg=fg_color)
+        self.botao_executar.pack(side=tk.LEFT, padx=10)
+        self.botao_cancelar = tk.Button(top_frame, text="Cancelar", command=self.cancelar, bg="#3A3D41", fg=fg_color, state=tk.DISABLED)
+        self.botao_cancelar.pack(side=tk.LEFT, padx=10)
+        self.botao_metricas = tk.Button(top_frame, text="Métricas", command=self.abrir_metricas, bg="#3A3D41", fg=fg_color, state=tk.DISABLED)
+        self.botao_metricas.pack(side=tk.LEFT, padx=10)
+        self.botao_salvar_traco = tk.Button(top_frame, text="Salvar Traço", command=self.salvar_traco, bg="#3A3D41", fg=fg_color, state=tk.DISABLED)
+        self.botao_salvar_traco.pack(side=tk.LEFT, padx=10)
+        tk.Button(top_frame, text="Abrir Traço", command=self.abrir_traco, bg="#3A3D41", fg=fg_color).pack(side=tk.LEFT, padx=10)
+        # Tempo e alocações por fase na barra de status (desligado não custa nada)
+        self.instrumentar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(top_frame, text="Instrumentar", variable=self.instrumentar_var, bg=bg_color, fg=fg_color,
+                       selectcolor="#252526", activebackground=bg_color).pack(side=tk.LEFT, padx=5)
+
+        # Progresso da simulação, que roda numa thread separada
+        self.progresso_var = tk.DoubleVar(value=0)
+        ttk.Progressbar(top_frame, variable=self.progresso_var, maximum=100, length=200).pack(side=tk.LEFT, padx=10)
+        self.status_var = tk.StringVar(value="")
+        tk.Label(top_frame, textvariable=self.status_var, bg=bg_color, fg=fg_color).pack(side=tk.LEFT, padx=5)
+
+        self.trabalho = None
+        # Agregados por tarefa da última simulação mostrada (metricas_por_tarefa)
+        self.metricas = None
+        # Última simulação mostrada, para gravar em traço (traco.py)
+        self.ultimo = None
+        # Resultados recentes (escalonamento e figura) por conjunto/algoritmo/horizonte
+        self.cache = CacheSimulacao()
+        # Última simulação por (algoritmo, horizonte), com checkpoints, para ressimular após edições
+        self.anteriores = {}
         self.fig_frame = tk.Frame(master, bg=bg_color, padx=10, pady=10)
         self.fig_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
 
     def abrir_editor_tarefas(self):
         EditorTarefas(self.master, self.tarefas)
 
+    def abrir_metricas(self):
+        if self.metricas is not None:
+            JanelaMetricas(self.master, self.metricas)
+
     def executar(self):
         tipo = self.tipo_analise_var.get()
         if not self.tarefas:
             messagebox.showwarning("Aviso", "Não há tarefas para escalonar.")
             return
-        periodos = [t.periodo for t in self.tarefas]
-        hiper_periodo = calcular_mmc_lista(periodos)
-
-        if tipo == "DM" or tipo == "dm":
-            atribuir_prioridades_dm(self.tarefas)
-        elif tipo == "RM" or tipo == "rm":
-            atribuir_prioridades_rm(self.tarefas)
-        else:
-            for t in self.tarefas:
-                t.prioridade = None
+        if self.trabalho is not None:
+            return
 
-        instancias = gerar_instancias(self.tarefas, hiper_periodo)
+        # A thread trabalha sobre uma cópia: o editor pode mudar self.tarefas enquanto isso
+        tarefas = [Tarefa(t.nome, t.periodo, t.deadline, t.tempo_computacao) for t in self.tarefas]
+        try:
+            nucleos = max(1, int(self.nucleos_var.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Erro", "Número de núcleos inválido.")
+            return
+        instrumentacao = Instrumentacao() if self.instrumentar_var.get() else DESLIGADA
+        self.iniciar_trabalho(self.simular, tarefas, tipo, self.horizonte_var.get(),
+                              nucleos=nucleos, estrategia=self.estrategia_var.get().lower(),
+                              instrumentacao=instrumentacao)
+
+    def iniciar_trabalho(self, alvo, *args, **kwargs):
+        # alvo(*args, cancelado, fila, **kwargs) roda numa thread; verificar_trabalho acompanha a fila
+        cancelado = threading.Event()
+        fila = queue.Queue()
+        threading.Thread(target=alvo, args=(*args, cancelado, fila), kwargs=kwargs, daemon=True).start()
+        self.trabalho = (cancelado, fila)
+
+        self.botao_executar.configure(state=tk.DISABLED)
+        self.botao_cancelar.configure(state=tk.NORMAL)
+        self.progresso_var.set(0)
+        self.status_var.set("Iniciando...")
+        self.master.after(100, self.verificar_trabalho)
+
+    def cancelar(self):
+        if self.trabalho is not None:
+            self.trabalho[0].set()
+            self.status_var.set("Cancelando...")
+
+    def simular(self, tarefas, tipo, modo_horizonte, cancelado, fila, nucleos=1, estrategia="global",
+                instrumentacao=DESLIGADA):
+        # Roda fora da thread do Tk: não pode tocar em widgets, só na fila.
+        # Geração, simulação e construção da figura; o canvas fica para verificar_trabalho.
+        # Cada etapa é uma fase de 'instrumentacao' (o desenho no canvas entra em verificar_trabalho).
+        medir = instrumentacao.medir
+        def fase(nome, inicio, fim):
+            def progresso(feito, total):
+                if cancelado.is_set():
+                    raise SimulacaoCancelada()
+                fila.put(('progresso', nome, inicio + (fim - inicio) * feito / max(total, 1)))
+            progresso(0, 1)
+            return progresso
+
+        try:
+            modo = "verificacao" if modo_horizonte == "Verificação" else "hiperperiodo"
+            if nucleos > 1:
+                # O horizonte de verificação é de uniprocessador: com vários núcleos, o hiperperíodo
+                modo = "hiperperiodo"
+                chave = chave_simulacao(tarefas, tipo, modo, nucleos=nucleos, estrategia=estrategia)
+            else:
+                chave = chave_simulacao(tarefas, tipo, modo)
+            with medir("cache"):
+                resultado = self.cache.obter(chave)
+            if resultado is not None:
+                fila.put(('pronto', {**resultado, 'instrumentacao': instrumentacao}))
+                return
 
-        tipo_lower = tipo.lower()
-        if tipo_lower == "edf":
-            linha_do_tempo = escalonamento_edf(instancias, hiper_periodo)
-        elif tipo_lower == "dm":
-            linha_do_tempo = escalonamento_dm(instancias, hiper_periodo)
-        else:
-            linha_do_tempo = escalonamento_rm(instancias, hiper_periodo)
+            fase("Analisando", 0, 5)
+            with medir("mmc"):
+                periodos = [t.periodo for t in tarefas]
+                hiper_periodo = calcular_mmc_lista(periodos)
+
+            with medir("análise"):
+                if tipo == "DM" or tipo == "dm":
+                    atribuir_prioridades_dm(tarefas)
+                elif tipo == "RM" or tipo == "rm":
+                    atribuir_prioridades_rm(tarefas)
+                elif tipo == "OPA" or tipo == "opa":
+                    atribuir_prioridades_opa(tarefas)
+                else:
+                    for t in tarefas:
+                        t.prioridade = None
+                # O veredito vem do primeiro teste que decide; RTA/QPA rodam sempre
+                # para a tabela por tarefa da figura
+                verificacao = verificar_escalonabilidade(tarefas, tipo, detalhes=True)
+            analise = verificacao.get('analise')
+            qpa = verificacao.get('qpa')
+
+            tipo_lower = tipo.lower()
+            if nucleos > 1:
+                self.simular_multiprocessador(tarefas, tipo_lower, hiper_periodo, nucleos, estrategia, chave, fila, fase,
+                                              instrumentacao)
+                return
 
-        fig = plotar_simulacao(self.tarefas, linha_do_tempo, instancias, tipo_lower)
+            # Simula em unidades de mdc(P, D, C) ms; resultados voltam para ms antes das métricas
+            normalizadas, escala = normalizar_tarefas(tarefas)
+            tempo_total = hiper_periodo // escala
+            horizonte = None
+            if modo_horizonte == "Verificação":
+                with medir("horizonte"):
+                    horizonte = horizonte_verificacao(normalizadas, tipo)
+                tempo_total = horizonte['horizonte']
+                horizonte = {**horizonte, 'horizonte': tempo_total * escala,
+                             'hiper_periodo': horizonte['hiper_periodo'] * escala}
+                hiper_periodo = horizonte['horizonte']
+
+            anterior = self.anteriores.get((tipo_lower, modo))
+            if anterior is not None and anterior['tempo_total'] == tempo_total and anterior['escala'] == escala:
+                # Mesmo horizonte: só refaz o que a edição das tarefas pode ter mudado
+                with medir("ressimulação"):
+                    resultado = ressimular(normalizadas, anterior['tarefas'], anterior, tempo_total, tipo_lower,
+                                           fase("Simulando", 5, 85))
+            else:
+                with medir("instâncias"):
+                    instancias = gerar_instancias(normalizadas, tempo_total, fase("Gerando instâncias", 5, 25))
+                checkpoints = []
+                with medir("simulação"):
+                    intervalos = escalonamento_eventos(instancias, tempo_total, tipo_lower, fase("Simulando", 25, 85),
+                                                       checkpoints)
+                resultado = {'instancias': instancias, 'intervalos': intervalos, 'checkpoints': checkpoints}
+            self.anteriores[(tipo_lower, modo)] = {**resultado, 'tarefas': congelar_tarefas(normalizadas),
+                                                   'tempo_total': tempo_total, 'escala': escala}
+            with medir("desnormalização"):
+                instancias, intervalos = desnormalizar(resultado['instancias'], resultado['intervalos'], escala)
+
+            fase("Desenhando", 85, 100)
+            with medir("métricas"):
+                metricas = metricas_instancias(instancias, intervalos, hiper_periodo)
+                por_tarefa = metricas_por_tarefa(tarefas, metricas)
+            with medir("figura"):
+                fig = plotar_simulacao(tarefas, intervalos, instancias, tipo_lower, analise, qpa, horizonte,
+                                       metricas=metricas, verificacao=verificacao)
+            # Só em memória: a figura do matplotlib não vai para o disco
+            resultado = {'tarefas': tarefas, 'tipo': tipo_lower, 'tempo_total': hiper_periodo, 'nucleos': 1,
+                         'instancias': instancias, 'intervalos': intervalos, 'analise': analise,
+                         'qpa': qpa, 'verificacao': verificacao, 'horizonte': horizonte, 'metricas': por_tarefa,
+                         'figura': fig}
+            self.cache.guardar(chave, resultado, persistir=False)
+            fila.put(('pronto', {**resultado, 'instrumentacao': instrumentacao}))
+        except SimulacaoCancelada:
+            fila.put(('cancelado',))
+        except Exception as erro:
+            fila.put(('erro', erro))
+
+    def simular_multiprocessador(self, tarefas, tipo_analise, hiper_periodo, nucleos, estrategia, chave, fila, fase,
+                                 instrumentacao=DESLIGADA):
+        # Sem ressimulação incremental: cada execução simula o hiperperíodo inteiro.
+        # Os testes exatos de uniprocessador não valem para o conjunto todo; o
+        # veredito vem da simulação e da partição.
+        medir = instrumentacao.medir
+        particao = None
+        if estrategia != "global":
+            with medir("partição"):
+                particao = particionar(tarefas, nucleos, estrategia, tipo_analise)[0]
+        with medir("instâncias"):
+            instancias = gerar_instancias(tarefas, hiper_periodo, fase("Gerando instâncias", 5, 20))
+        with medir("simulação"):
+            if particao is None:
+                intervalos = escalonamento_global(instancias, hiper_periodo, nucleos, tipo_analise,
+                                                  fase("Simulando", 20, 60))
+            else:
+                intervalos = escalonamento_particionado(instancias, hiper_periodo, particao, tipo_analise,
+                                                        fase("Simulando", 20, 60))
+        with medir("métricas"):
+            metricas = metricas_instancias(instancias, intervalos, hiper_periodo)
+            por_tarefa = metricas_por_tarefa(tarefas, metricas)
+
+        # Sem perdas nem trabalho pendente, a simulação acima já mostra que 'nucleos' basta
+        viavel = None
+        if not metricas['perdida'].any() and all(i.tempo_restante <= 0 for i in instancias):
+            viavel = nucleos
+        with medir("núcleos necessários"):
+            necessarios = nucleos_necessarios(tarefas, estrategia, tipo_analise, progresso=fase("Núcleos necessários", 60, 85),
+                                              viavel=viavel if particao is None else None)
+
+        fase("Desenhando", 85, 100)
+        with medir("figura"):
+            fig = plotar_simulacao(tarefas, intervalos, instancias, tipo_analise, nucleos=nucleos, particao=particao,
+                                   necessarios=necessarios, metricas=metricas)
+        resultado = {'tarefas': tarefas, 'tipo': tipo_analise, 'tempo_total': hiper_periodo, 'nucleos': nucleos,
+                     'instancias': instancias, 'intervalos': intervalos, 'particao': particao,
+                     'necessarios': necessarios, 'metricas': por_tarefa, 'figura': fig}
+        self.cache.guardar(chave, resultado, persistir=False)
+        fila.put(('pronto', {**resultado, 'instrumentacao': instrumentacao}))
+
+    def salvar_traco(self):
+        if self.ultimo is None:
+            return
+        caminho = filedialog.asksaveasfilename(defaultextension=".trc", filetypes=[("Traço de escalonamento", "*.trc")])
+        if not caminho:
+            return
+        ultimo = self.ultimo
+        try:
+            with EscritorTraco(caminho, ultimo['tarefas'], algoritmo=ultimo['tipo'], tempo_total=ultimo['tempo_total'],
+                               nucleos=ultimo['nucleos']) as traco:
+                traco.escrever(ultimo['intervalos'])
+        except OSError as erro:
+            messagebox.showerror("Erro", f"Falha ao gravar o traço: {erro}")
+
+    def abrir_traco(self):
+        if self.trabalho is not None:
+            return
+        caminho = filedialog.askopenfilename(filetypes=[("Traço de escalonamento", "*.trc"), ("Todos", "*")])
+        if caminho:
+            self.iniciar_trabalho(self.carregar_traco, caminho)
+
+    def carregar_traco(self, caminho, cancelado, fila):
+        # Roda na thread de trabalho, como simular: o traço substitui a simulação
+        try:
+            fila.put(('progresso', "Lendo traço", 0))
+            with LeitorTraco(caminho) as leitor:
+                tarefas = leitor.tarefas
+                info = leitor.info
+                instancias, intervalos = leitor.reconstruir()
+            if cancelado.is_set():
+                raise SimulacaoCancelada()
+            fila.put(('progresso', "Desenhando", 50))
+            tempo_total = info['tempo_total']
+            nucleos = info.get('nucleos', 1)
+            metricas = metricas_instancias(instancias, intervalos, tempo_total)
+            fig = plotar_simulacao(tarefas, intervalos, instancias, info['algoritmo'], nucleos=nucleos, metricas=metricas)
+            fila.put(('pronto', {'tarefas': tarefas, 'tipo': info['algoritmo'], 'tempo_total': tempo_total,
+                                 'nucleos': nucleos, 'instancias': instancias, 'intervalos': intervalos,
+                                 'metricas': metricas_por_tarefa(tarefas, metricas), 'figura': fig}))
+        except SimulacaoCancelada:
+            fila.put(('cancelado',))
+        except Exception as erro:
+            fila.put(('erro', erro))
+
+    def verificar_trabalho(self):
+        # Polling da fila da thread de simulação pelo after() do Tk
+        fila = self.trabalho[1]
+        try:
+            while True:
+                mensagem = fila.get_nowait()
+                if mensagem[0] == 'progresso':
+                    self.status_var.set(mensagem[1] + "...")
+                    self.progresso_var.set(mensagem[2])
+                else:
+                    break
+        except queue.Empty:
+            self.master.after(100, self.verificar_trabalho)
+            return
 
+        self.trabalho = None
+        self.botao_executar.configure(state=tk.NORMAL)
+        self.botao_cancelar.configure(state=tk.DISABLED)
+        if mensagem[0] == 'cancelado':
+            self.progresso_var.set(0)
+            self.status_var.set("Cancelado")
+        elif mensagem[0] == 'erro':
+            self.progresso_var.set(0)
+            self.status_var.set("")
+            messagebox.showerror("Erro", f"Falha na simulação: {mensagem[1]}")
+        else:
+            self.progresso_var.set(100)
+            self.status_var.set("")
+            self.ultimo = mensagem[1]
+            self.metricas = self.ultimo['metricas']
+            self.botao_metricas.configure(state=tk.NORMAL)
+            self.botao_salvar_traco.configure(state=tk.NORMAL)
+            instrumentacao = self.ultimo.get('instrumentacao', DESLIGADA)
+            with instrumentacao.medir("desenho"):
+                self.mostrar_figura(self.ultimo['figura'])
+            if instrumentacao.ativa:
+                self.status_var.set(instrumentacao.resumo())
+
+    def mostrar_figura(self, fig):
         for widget in self.fig_frame.winfo_children():
             widget.destroy()
 
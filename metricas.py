@@ -0,0 +1,108 @@
+# Métricas de escalonamento a partir dos intervalos simulados, sem matplotlib:
+# servem à interface (plotagem.py, janela de métricas) e ao lote.
+# Uma passada linear pelos intervalos monta arrays NumPy por instância (job);
+# os agregados por tarefa saem desses arrays.
+import numpy as np
+
+PERCENTIS = (50, 90, 99)
+
+def metricas_instancias(instancias, intervalos, horizonte):
+    # Arrays alinhados com 'instancias' (NaN onde não se aplica):
+    # - inicio/fim: primeira e última execução; termino: fim, se concluída
+    # - resposta = termino - liberação; latencia = início - liberação
+    # - atraso (lateness) = termino - deadline (negativo = folga)
+    # - preempcoes: trechos de execução - 1
+    # - perdida: terminou depois do deadline ou não terminou com o deadline
+    #   dentro do horizonte (o mesmo critério de perdas_de_deadline)
+    # 'lacunas' guarda cada interrupção: (índice da instância, fim do trecho, início do próximo).
+    # Os intervalos vêm em ordem de início, como devolvem os escalonadores.
+    # O laço usa listas (acesso a elemento de array NumPy é bem mais lento)
+    n = len(instancias)
+    posicao = {instancia: k for k, instancia in enumerate(instancias)}
+    inicio = [np.nan] * n
+    fim = [np.nan] * n
+    trechos = [0] * n
+    lacunas = ([], [], [])
+    for intervalo in intervalos:
+        # Aceita também (instancia, inicio, fim, nucleo), de multiprocessador.py
+        k = posicao[intervalo[0]]
+        if trechos[k] == 0:
+            inicio[k] = intervalo[1]
+        else:
+            lacunas[0].append(k)
+            lacunas[1].append(fim[k])
+            lacunas[2].append(intervalo[1])
+        fim[k] = intervalo[2]
+        trechos[k] += 1
+
+    inicio = np.array(inicio, dtype=float)
+    fim = np.array(fim, dtype=float)
+    trechos = np.array(trechos, dtype=np.int64)
+    tarefa_id = np.fromiter((j.tarefa_id for j in instancias), dtype=np.int64, count=n)
+    liberacao = np.fromiter((j.tempo_liberacao for j in instancias), dtype=float, count=n)
+    deadline = np.fromiter((j.deadline_absoluto for j in instancias), dtype=float, count=n)
+    concluida = np.fromiter((j.tempo_restante <= 0 for j in instancias), dtype=bool, count=n)
+
+    # Concluída sem executar (C = 0): termina na própria liberação
+    termino = np.where(concluida, np.where(trechos > 0, fim, liberacao), np.nan)
+    atraso = termino - deadline
+    perdida = np.where(concluida, atraso > 0, deadline <= horizonte)
+    return {
+        'tarefa_id': tarefa_id,
+        'liberacao': liberacao,
+        'deadline': deadline,
+        'inicio': inicio,
+        'fim': fim,
+        'termino': termino,
+        'concluida': concluida,
+        'resposta': termino - liberacao,
+        'latencia': inicio - liberacao,
+        'atraso': atraso,
+        'preempcoes': np.maximum(trechos - 1, 0),
+        'perdida': perdida,
+        'lacunas': tuple(np.array(coluna, dtype=dtype)
+                         for coluna, dtype in zip(lacunas, (np.int64, float, float))),
+    }
+
+def metricas_por_tarefa(tarefas, metricas):
+    # Agregados por tarefa (na ordem de 'tarefas'): pior, médio e percentis do
+    # tempo de resposta, latência de início, jitter de saída (variação do tempo
+    # de resposta) e de início, preempções, perdas e maior atraso.
+    # Valores sem instância concluída ficam None.
+    ordem = np.argsort(metricas['tarefa_id'], kind='stable')
+    cortes = np.searchsorted(metricas['tarefa_id'][ordem], np.arange(len(tarefas) + 1))
+
+    agregados = []
+    for tarefa_id, t in enumerate(tarefas):
+        selecao = ordem[cortes[tarefa_id]:cortes[tarefa_id + 1]]
+        concluidas = selecao[metricas['concluida'][selecao]]
+        resposta = metricas['resposta'][concluidas]
+        latencia = metricas['latencia'][selecao]
+        latencia = latencia[~np.isnan(latencia)]
+        registro = {
+            'nome': t.nome,
+            'instancias': len(selecao),
+            'concluidas': len(concluidas),
+            'perdas': int(metricas['perdida'][selecao].sum()),
+            'preempcoes': int(metricas['preempcoes'][selecao].sum()),
+        }
+        if len(resposta):
+            registro['resposta_max'] = float(resposta.max())
+            registro['resposta_media'] = float(resposta.mean())
+            for p, r in zip(PERCENTIS, np.percentile(resposta, PERCENTIS)):
+                registro[f'resposta_p{p}'] = float(r)
+            registro['jitter_saida'] = float(resposta.max() - resposta.min())
+            registro['atraso_max'] = float(metricas['atraso'][concluidas].max())
+        else:
+            registro['resposta_max'] = registro['resposta_media'] = None
+            for p in PERCENTIS:
+                registro[f'resposta_p{p}'] = None
+            registro['jitter_saida'] = registro['atraso_max'] = None
+        if len(latencia):
+            registro['latencia_max'] = float(latencia.max())
+            registro['latencia_media'] = float(latencia.mean())
+            registro['jitter_inicio'] = float(latencia.max() - latencia.min())
+        else:
+            registro['latencia_max'] = registro['latencia_media'] = registro['jitter_inicio'] = None
+        agregados.append(registro)
+    return agregados
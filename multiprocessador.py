@@ -0,0 +1,205 @@
+# Escalonamento em m processadores idênticos:
+# - global: uma fila de prontos única e, a cada instante, as m instâncias mais
+#   prioritárias executando (EDF global ou prioridade fixa global, DM/RM);
+# - particionado: cada tarefa presa a um núcleo escolhido por bin-packing
+#   (first/best/worst-fit decreasing) com o teste exato de uniprocessador em
+#   cada núcleo (QPA para EDF, RTA para DM/RM); cada núcleo é uma CPU comum.
+# Os intervalos ganham o núcleo: (instancia, inicio, fim, nucleo).
+import heapq
+import math
+from fractions import Fraction
+from operator import itemgetter
+
+from escalonadores import (FilaProntos, campo_prioridade, fluxo_liberacoes, registrar_execucao,
+                           gerar_instancias, escalonamento_eventos, perdas_de_deadline, PASSOS_PROGRESSO)
+from analise import analise_tempo_resposta, teste_qpa_edf
+from tarefas import calcular_mmc_lista
+
+HEURISTICAS = ("ffd", "bfd", "wfd")
+
+def juntar_nucleos(por_nucleo):
+    # Listas [(instancia, inicio, fim)] de cada núcleo -> uma lista ordenada pelo início
+    return list(heapq.merge(*([(i, inicio, fim, c) for i, inicio, fim in intervalos]
+                              for c, intervalos in enumerate(por_nucleo)), key=itemgetter(1)))
+
+def escalonamento_global(instancias, tempo_total, nucleos, tipo_analise="edf", progresso=None):
+    # Simulação por eventos com fila global: o relógio salta para a próxima
+    # liberação ou conclusão. Quem continua entre as m mais prioritárias fica no
+    # mesmo núcleo e as que entram ocupam os núcleos livres em ordem, para não
+    # migrar instâncias sem necessidade.
+    # progresso(tempo, tempo_total): como em escalonamento_eventos (pode levantar
+    # SimulacaoCancelada).
+    por_nucleo = [[] for _ in range(nucleos)]
+    tarefas_prontas = FilaProntos(campo_prioridade(tipo_analise))
+    liberacoes = fluxo_liberacoes(instancias)
+    proxima = next(liberacoes, None)
+    em_execucao = [None] * nucleos
+    tempo = 0
+    passos = 0
+    while tempo < tempo_total:
+        if progresso is not None:
+            passos += 1
+            if passos % PASSOS_PROGRESSO == 0:
+                progresso(tempo, tempo_total)
+
+        while proxima is not None and proxima.tempo_liberacao <= tempo:
+            if proxima.tempo_restante > 0:
+                tarefas_prontas.inserir(proxima)
+            proxima = next(liberacoes, None)
+
+        if proxima is not None:
+            proximo_evento = min(proxima.tempo_liberacao, tempo_total)
+        else:
+            proximo_evento = tempo_total
+
+        escolhidas = tarefas_prontas.retirar_primeiras(nucleos)
+        if not escolhidas:
+            # Todas as CPUs ociosas até a próxima liberação
+            em_execucao = [None] * nucleos
+            tempo = proximo_evento
+            continue
+
+        selecionadas = {entrada[-1] for entrada in escolhidas}
+        em_execucao = [i if i in selecionadas else None for i in em_execucao]
+        continuam = set(em_execucao)
+        livres = (c for c in range(nucleos) if em_execucao[c] is None)
+        for entrada in escolhidas:
+            if entrada[-1] not in continuam:
+                em_execucao[next(livres)] = entrada[-1]
+
+        fim = min(proximo_evento, min(tempo + entrada[-1].tempo_restante for entrada in escolhidas))
+        for c, instancia in enumerate(em_execucao):
+            if instancia is not None:
+                instancia.tempo_restante -= fim - tempo
+                registrar_execucao(por_nucleo[c], instancia, tempo, fim)
+
+        for entrada in escolhidas:
+            if entrada[-1].tempo_restante > 0:
+                tarefas_prontas.devolver(entrada)
+        tempo = fim
+    return juntar_nucleos(por_nucleo)
+
+def cabe_no_nucleo(tarefas, tipo_analise="edf"):
+    # Teste exato de uniprocessador para as tarefas de um núcleo
+    if tipo_analise.lower() == "edf":
+        return teste_qpa_edf(tarefas)['escalonavel']
+    return all(a['escalonavel'] for a in analise_tempo_resposta(tarefas))
+
+def particionar(tarefas, nucleos, heuristica="ffd", tipo_analise="edf"):
+    # Bin-packing em ordem decrescente de utilização. Cada tarefa vai para o
+    # primeiro núcleo candidato que continua escalonável com ela:
+    # - ffd: núcleos em ordem; bfd: o mais carregado antes; wfd: o menos carregado antes.
+    # Em DM/RM vale a 'prioridade' já atribuída ao conjunto todo (a ordem
+    # relativa dentro de cada núcleo é a mesma).
+    # Devolve (particao, nao_alocadas): tarefa_id por núcleo e as que não couberam.
+    if heuristica not in HEURISTICAS:
+        raise ValueError(f"Heurística de particionamento desconhecida: {heuristica}")
+    utilizacao = [Fraction(t.tempo_computacao, t.periodo) for t in tarefas]
+    particao = [[] for _ in range(nucleos)]
+    carga = [Fraction(0)] * nucleos
+    nao_alocadas = []
+    for i in sorted(range(len(tarefas)), key=lambda i: -utilizacao[i]):
+        if heuristica == "ffd":
+            candidatos = range(nucleos)
+        elif heuristica == "bfd":
+            candidatos = sorted(range(nucleos), key=lambda c: -carga[c])
+        else:
+            candidatos = sorted(range(nucleos), key=lambda c: carga[c])
+        for c in candidatos:
+            if carga[c] + utilizacao[i] <= 1 and cabe_no_nucleo([tarefas[j] for j in particao[c]] + [tarefas[i]], tipo_analise):
+                particao[c].append(i)
+                carga[c] += utilizacao[i]
+                break
+        else:
+            nao_alocadas.append(i)
+    # Dentro de cada núcleo, a ordem original das tarefas (a mesma dos desempates)
+    return [sorted(ids) for ids in particao], nao_alocadas
+
+def escalonamento_particionado(instancias, tempo_total, particao, tipo_analise="edf", progresso=None):
+    # Cada núcleo simulado como uma CPU com as instâncias das suas tarefas;
+    # instâncias de tarefas fora da partição não executam.
+    # progresso(feito, total) conta os núcleos em sequência: total = m * tempo_total
+    nucleo_da_tarefa = {i: c for c, ids in enumerate(particao) for i in ids}
+    instancias_nucleo = [[] for _ in particao]
+    for instancia in instancias:
+        c = nucleo_da_tarefa.get(instancia.tarefa_id)
+        if c is not None:
+            instancias_nucleo[c].append(instancia)
+
+    def progresso_nucleo(c):
+        if progresso is None:
+            return None
+        return lambda tempo, _: progresso(c * tempo_total + tempo, len(particao) * tempo_total)
+
+    return juntar_nucleos([escalonamento_eventos(lista, tempo_total, tipo_analise, progresso_nucleo(c))
+                           for c, lista in enumerate(instancias_nucleo)])
+
+def escalonavel_global(tarefas, nucleos, tipo_analise="edf", progresso=None):
+    # Veredito por simulação de um hiperperíodo a partir da liberação síncrona:
+    # sem perdas e sem trabalho pendente no fim (aí o padrão se repete). É
+    # exato para esse padrão de liberações; com D > T pode recusar conjuntos
+    # cujo trabalho pendente ainda cumpriria o deadline.
+    hiper_periodo = calcular_mmc_lista([t.periodo for t in tarefas])
+    instancias = gerar_instancias(tarefas, hiper_periodo, progresso)
+    intervalos = escalonamento_global(instancias, hiper_periodo, nucleos, tipo_analise, progresso)
+    return (not perdas_de_deadline(instancias, intervalos, hiper_periodo)
+            and all(i.tempo_restante <= 0 for i in instancias))
+
+def limite_global(tarefas, nucleos, tipo_analise="edf"):
+    # Testes suficientes de densidade (δ = C / min(D, T)) para tarefas esporádicas
+    # em m núcleos, o que inclui a liberação síncrona simulada:
+    # - EDF global (Goossens, Funk e Baruah): Σδ <= m - (m - 1) δmax;
+    # - DM global (Bertogna, Cirinei e Lipari): Σδ <= m/2 (1 - δmax) + δmax.
+    # Só com D <= T, em que cumprir os deadlines já implica nada pendente no fim
+    # do hiperperíodo, e em DM só com as prioridades em ordem de deadline.
+    if any(t.deadline > t.periodo for t in tarefas):
+        return False
+    densidades = [Fraction(t.tempo_computacao, t.deadline) for t in tarefas]
+    total, maxima = sum(densidades), max(densidades)
+    if tipo_analise.lower() == "edf":
+        return total <= nucleos - (nucleos - 1) * maxima
+    ordenadas = sorted(tarefas, key=lambda t: t.prioridade)
+    if any(a.deadline > b.deadline for a, b in zip(ordenadas, ordenadas[1:])):
+        return False
+    return total <= Fraction(nucleos, 2) * (1 - maxima) + maxima
+
+def tarefas_sem_nucleo(tarefas):
+    # Tarefas com C > min(D, T): perdem deadline até sozinhas num núcleo, e
+    # nenhum número de núcleos resolve
+    return [t for t in tarefas if t.tempo_computacao > min(t.deadline, t.periodo)]
+
+def nucleos_necessarios(tarefas, estrategia="ffd", tipo_analise="edf", maximo=None, progresso=None, viavel=None):
+    # Menor número de núcleos com que o conjunto é escalonável pela estratégia
+    # ("global" ou uma das HEURISTICAS), a partir de ceil(U). Devolve None se
+    # não couber nem em 'maximo' núcleos (padrão: uma tarefa por núcleo) ou se
+    # alguma tarefa não cabe em núcleo nenhum (tarefas_sem_nucleo).
+    # viavel: um número de núcleos já sabidamente suficiente (ex.: o da simulação
+    # que acabou de rodar sem perdas), que poupa uma simulação.
+    # progresso(feito, total) é repassado às simulações e pode cancelar.
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    if maximo is None:
+        maximo = len(tarefas)
+    minimo = max(1, math.ceil(U))
+    if minimo > maximo or tarefas_sem_nucleo(tarefas):
+        return None
+
+    if estrategia != "global":
+        # Só testes analíticos por núcleo: a busca linear é barata
+        for m in range(minimo, maximo + 1):
+            if progresso is not None:
+                progresso(m - minimo, maximo - minimo + 1)
+            if not particionar(tarefas, m, estrategia, tipo_analise)[1]:
+                return m
+        return None
+
+    # Global: de ceil(U) para cima, o primeiro m que basta. Sob prioridade global
+    # o veredito nem sempre é monotônico em m (anomalias), então uma busca binária
+    # poderia pular o menor; a linear não. O teste de densidade aceita sem
+    # simular, e só as recusas dele custam um hiperperíodo simulado. Com uma
+    # tarefa por núcleo (e C <= min(D, T)) toda instância executa ao ser liberada.
+    for m in range(minimo, maximo + 1):
+        if m == viavel or m >= len(tarefas) or limite_global(tarefas, m, tipo_analise):
+            return m
+        if escalonavel_global(tarefas, m, tipo_analise, progresso):
+            return m
+    return None
@@ -1,42 +1,277 @@
+from fractions import Fraction
+from itertools import chain
+
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import matplotlib.cm as cm
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.ticker import MaxNLocator, MultipleLocator
 
 from escalonadores import construir_intervalos
+from metricas import metricas_instancias
+from multiprocessador import tarefas_sem_nucleo
 from tarefas import calcular_mmc_lista
 
-def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf"):
-    intervalos = construir_intervalos(linha_do_tempo)
+# Acima disso, números por ms/intervalo viram poluição visual e custo de desenho
+LIMITE_ROTULOS = 500
+# Até essa largura visível (ms), um tick e uma linha de grade por ms
+LIMITE_TICKS = 100
+
+def ocupacao_acumulada(inicios, soma_inicios, fins, soma_fins, t):
+    # B(t): tempo de execução acumulado até cada t, somando (t - início) dos
+    # intervalos já começados e descontando (t - fim) dos já terminados.
+    # inicios/fins ordenados; soma_*[k] é a soma dos k primeiros. Vale também
+    # para intervalos sobrepostos (mesma tarefa em dois núcleos).
+    k_inicio = np.searchsorted(inicios, t, side='right')
+    k_fim = np.searchsorted(fins, t, side='right')
+    return (k_inicio * t - soma_inicios[k_inicio]) - (k_fim * t - soma_fins[k_fim])
+
+def um_por_pixel(x, y, x0, largura_pixel):
+    # Mantém um ponto por (pixel, linha): o resto só ficaria desenhado por cima
+    if len(x) == 0:
+        return x, y
+    chaves = np.column_stack((np.floor((x - x0) / largura_pixel), y))
+    _, indices = np.unique(chaves, axis=0, return_index=True)
+    return x[indices], y[indices]
+
+class VisaoEscalonamento:
+    # Desenha no Gantt (e nas ativações) só o que cai nos limites de x atuais e
+    # redesenha quando o zoom/pan da NavigationToolbar2Tk muda esses limites.
+    # Com mais intervalos visíveis do que pixels, cada linha vira uma faixa de
+    # utilização por pixel em vez de barras individuais.
+    def __init__(self, ax_gantt, ax_ativacoes, intervalos, instancias, espera, interrompido, marcas,
+                 linha_tarefa, cores, linhas_cpu, numero_tarefas):
+        # linhas_cpu: linha do gráfico de cada núcleo; intervalos com 4 campos
+        # trazem o núcleo (multiprocessador.py), com 3 tudo roda no núcleo 0
+        self.ax_gantt = ax_gantt
+        self.ax_ativacoes = ax_ativacoes
+        self.cores = cores
+        self.linhas_cpu = linhas_cpu
+        self.numero_tarefas = numero_tarefas
+        self.artistas = []
+        self.limites = None
+
+        self.intervalos = intervalos
+        self.inicio = np.array([i[1] for i in intervalos], dtype=float)
+        self.fim = np.array([i[2] for i in intervalos], dtype=float)
+        self.linha = np.array([linha_tarefa(i[0].tarefa_id) for i in intervalos], dtype=int)
+        self.nucleo = np.array([i[3] if len(i) > 3 else 0 for i in intervalos], dtype=int)
+
+        # Ocupação acumulada por linha (a linha de um núcleo soma todas as suas tarefas) para as faixas
+        self.ocupacao = {}
+        for y in range(numero_tarefas - 1 + len(linhas_cpu)):
+            if y in linhas_cpu:
+                selecao = self.nucleo == linhas_cpu.index(y)
+            else:
+                selecao = self.linha == y
+            inicios = np.sort(self.inicio[selecao])
+            fins = np.sort(self.fim[selecao])
+            self.ocupacao[y] = (inicios, np.concatenate(([0.0], np.cumsum(inicios))),
+                                fins, np.concatenate(([0.0], np.cumsum(fins))))
+
+        self.liberacao = np.array([j.tempo_liberacao for j in instancias], dtype=np.int64)
+        self.deadline = np.array([j.deadline_absoluto for j in instancias], dtype=np.int64)
+        self.linha_instancia = np.array([linha_tarefa(j.tarefa_id) for j in instancias], dtype=int)
+
+        # Retângulos (x, largura, y) e marcadores (x, y)
+        self.espera = np.array(espera, dtype=float).reshape(-1, 3)
+        self.interrompido = np.array(interrompido, dtype=float).reshape(-1, 3)
+        self.marcas = {nome: (np.array(x, dtype=float), np.array(y, dtype=float)) for nome, (x, y) in marcas.items()}
+
+        self.eixos = [ax for ax in (ax_ativacoes, ax_gantt) if ax is not None]
+        for ax in self.eixos:
+            # Eixos com sharex avisam os dois; 'limites' evita redesenhar duas vezes
+            ax.callbacks.connect('xlim_changed', lambda _ax: self.atualizar())
+
+    def atualizar(self):
+        x0, x1 = self.ax_gantt.get_xlim()
+        if (x0, x1) == self.limites:
+            return
+        self.limites = (x0, x1)
+
+        for artista in self.artistas:
+            artista.remove()
+        self.artistas = []
+
+        largura_px = max(1, int(self.ax_gantt.bbox.width))
+        for ax in self.eixos:
+            if x1 - x0 <= LIMITE_TICKS:
+                ax.xaxis.set_major_locator(MultipleLocator(1))
+            else:
+                ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+        self.desenhar_gantt(x0, x1, largura_px)
+        if self.ax_ativacoes is not None:
+            self.desenhar_ativacoes(x0, x1, largura_px)
+
+    def marcadores(self, ax, x, y, x0, x1, largura_px, **estilo):
+        visiveis = (x >= x0) & (x <= x1)
+        x, y = x[visiveis], y[visiveis]
+        if len(x) > largura_px:
+            x, y = um_por_pixel(x, y, x0, (x1 - x0) / largura_px)
+        self.artistas.append(ax.scatter(x, y, zorder=2, **estilo))
+
+    def desenhar_gantt(self, x0, x1, largura_px):
+        ax = self.ax_gantt
+
+        # Liberações
+        self.marcadores(ax, self.liberacao, self.linha_instancia, x0, x1, largura_px, marker='>', color='black')
+
+        # Intervalos que cruzam [x0, x1]
+        visiveis = np.nonzero((self.fim > x0) & (self.inicio < x1))[0]
+
+        if len(visiveis) * 2 <= largura_px:
+            # Detalhe: barras em cada núcleo e na linha de cada tarefa, um artista por linha
+            inicio = self.inicio[visiveis]
+            duracao = self.fim[visiveis] - inicio
+            linha = self.linha[visiveis]
+            nucleo = self.nucleo[visiveis]
+            for c, y_cpu in enumerate(self.linhas_cpu):
+                selecao = nucleo == c
+                self.artistas.append(ax.broken_barh(list(zip(inicio[selecao], duracao[selecao])), (y_cpu - 0.4, 0.8),
+                                                    facecolors=[self.cores[y] for y in linha[selecao]], edgecolor='black'))
+            for y in range(self.numero_tarefas - 1 + len(self.linhas_cpu)):
+                if y in self.linhas_cpu:
+                    continue
+                selecao = linha == y
+                self.artistas.append(ax.broken_barh(list(zip(inicio[selecao], duracao[selecao])), (y - 0.4, 0.8),
+                                                    facecolors=self.cores[y], edgecolor='black', alpha=0.7))
+
+            # Rótulos (número da execução e prioridade) só quando cabem na figura
+            if len(visiveis) <= LIMITE_ROTULOS:
+                for k, y, c in zip(visiveis.tolist(), linha.tolist(), nucleo.tolist()):
+                    instancia, inicio, fim = self.intervalos[k][:3]
+                    execucao_id = instancia.execucao_id
+                    prioridade = instancia.prioridade
+                    self.artistas.append(ax.text((inicio + fim) / 2, self.linhas_cpu[c], str(execucao_id), ha='center', va='center', color='white', fontsize=8))
+                    self.artistas.append(ax.text((inicio + fim) / 2, y, str(execucao_id), ha='center', va='center', color='white', fontsize=8))
+
+                    if prioridade is not None:
+                        prioridade = self.numero_tarefas - int(prioridade)
+                        self.artistas.append(ax.text((inicio + fim) / 2, y + 0.4, f"P{prioridade}", ha='center', va='bottom', color='black', fontsize=8))
+
+            # Esperas e interrupções que aparecem na janela
+            for retangulos, estilo in ((self.espera, dict(facecolor='gray', hatch='\\')),
+                                       (self.interrompido, dict(facecolor='y', hatch='/'))):
+                visiveis = retangulos[(retangulos[:, 0] < x1) & (retangulos[:, 0] + retangulos[:, 1] > x0)]
+                colecao = PatchCollection([patches.Rectangle((x, y - 0.4), w, 0.8) for x, w, y in visiveis],
+                                          alpha=0.3, edgecolor='black', **estilo)
+                self.artistas.append(ax.add_collection(colecao))
+
+            x, y = self.marcas['interrompido']
+            self.marcadores(ax, x, y, x0, x1, largura_px, marker='s', facecolor='blue', edgecolor='black', s=64)
+            x, y = self.marcas['cumprido']
+            self.marcadores(ax, x, y, x0, x1, largura_px, marker='$\u2713$', color='green', s=64)
+        else:
+            # Visão geral: fração de cada pixel ocupada pela linha, B(x + dx) - B(x)
+            bordas = np.linspace(x0, x1, largura_px + 1)
+            for y in range(self.numero_tarefas - 1 + len(self.linhas_cpu)):
+                utilizacao = np.diff(ocupacao_acumulada(*self.ocupacao[y], bordas)) / np.diff(bordas)
+                utilizacao = np.clip(utilizacao, 0, 1)
+                topo = y - 0.4 + 0.8 * np.append(utilizacao, utilizacao[-1])
+                cor = 'gray' if y in self.linhas_cpu else self.cores[y]
+                self.artistas.append(ax.fill_between(bordas, y - 0.4, topo, step='post',
+                                                     facecolor=cor, edgecolor='none', alpha=0.7))
+
+        # Perdas de deadline aparecem em qualquer escala
+        x, y = self.marcas['perdido']
+        self.marcadores(ax, x, y, x0, x1, largura_px, marker='X', facecolor='red', edgecolor='black', s=64)
+
+    def desenhar_ativacoes(self, x0, x1, largura_px):
+        ax = self.ax_ativacoes
+
+        # Marcar liberações no subplot superior
+        self.marcadores(ax, self.liberacao, self.linha_instancia, x0, x1, largura_px, marker='>', color='black')
+
+        # Contagem regressiva de deadlines das instâncias visíveis: com poucos
+        # valores na janela, um texto por ms; senão uma rampa por instância (da
+        # liberação ao deadline) numa única LineCollection e os deadlines num scatter
+        visiveis = (self.liberacao < x1) & (self.deadline > x0)
+        liberacao = self.liberacao[visiveis]
+        deadline = self.deadline[visiveis]
+        linha = self.linha_instancia[visiveis]
+        primeiro = int(np.floor(x0))
+        ultimo = int(np.ceil(x1))
+        total_contagem = int(np.sum(np.minimum(deadline, ultimo) - np.maximum(liberacao, primeiro)))
+        if total_contagem <= LIMITE_ROTULOS:
+            for lib, d, y in zip(liberacao.tolist(), deadline.tolist(), linha.tolist()):
+                for tempo in range(max(lib, primeiro), min(d, ultimo)):
+                    restante = d - tempo
+                    self.artistas.append(ax.text(tempo + 0.5, y, str(restante), ha='center', va='center', fontsize=7))
+        elif len(liberacao) <= largura_px:
+            rampas = np.stack((np.column_stack((liberacao, linha + 0.3)),
+                               np.column_stack((deadline, linha - 0.3))), axis=1)
+            self.artistas.append(ax.add_collection(LineCollection(rampas, colors='gray', linewidths=0.8)))
+            self.artistas.append(ax.scatter(deadline, linha, marker='|', color='black', zorder=2))
+        else:
+            self.marcadores(ax, deadline, linha, x0, x1, largura_px, marker='|', color='black')
+
+def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf", analise=None, qpa=None, horizonte=None,
+                     nucleos=1, particao=None, necessarios=None, metricas=None, verificacao=None):
+    # Aceita a linha do tempo por tick [(tempo, instancia)] ou já compactada em
+    # intervalos [(instancia, inicio, fim)], como devolve escalonamento_eventos,
+    # ou [(instancia, inicio, fim, nucleo)] do multiprocessador (uma linha por núcleo).
+    # 'particao' (tarefa_id por núcleo) vem do escalonamento particionado e
+    # 'necessarios' é o menor número de núcleos da estratégia (nucleos_necessarios).
+    # 'metricas' (metricas_instancias) é calculado aqui se não vier pronto.
+    # 'verificacao' (analise.verificar_escalonabilidade) dá o veredito analítico
+    # e o teste que o decidiu; sem ela, o veredito sai de 'analise'/'qpa'.
+    # Qualquer uma das formas pode vir como gerador (por exemplo expandir_intervalos):
+    # o formato sai do primeiro item, que volta à frente do restante
+    itens = iter(linha_do_tempo)
+    primeiro = next(itens, None)
+    if primeiro is None:
+        intervalos = []
+    elif len(primeiro) in (3, 4):
+        intervalos = linha_do_tempo if isinstance(linha_do_tempo, list) else list(chain([primeiro], itens))
+    else:
+        intervalos = construir_intervalos(chain([primeiro], itens))
     
     # Conta o número de tarefas + 1 (para a CPU)
     Numero_tarefas = len(tarefas) + 1
     
+    # Linhas do gráfico: os núcleos embaixo e as tarefas acima
+    Numero_linhas = len(tarefas) + nucleos
+
     # Cria a lista de tarefas invertida e adiciona a CPU no topo
     task_names = [t.nome for t in tarefas]
     task_names.reverse()  
-    nomes_tarefas = ["CPU"] + task_names
+    if nucleos == 1:
+        nomes_tarefas = ["CPU"] + task_names
+    else:
+        nomes_tarefas = [f"CPU {nucleos - r}" for r in range(nucleos)] + task_names
 
-    # Calcula o hiper-período
+    # Calcula o hiper-período (ou usa o horizonte de verificação simulado)
     periodos = [t.periodo for t in tarefas]
-    hiper_periodo = calcular_mmc_lista(periodos)
+    if horizonte is not None:
+        hiper_periodo = horizonte['horizonte']
+    else:
+        hiper_periodo = calcular_mmc_lista(periodos)
+
+    # Linha do gráfico de cada tarefa a partir do tarefa_id (CPU fica na linha 0;
+    # com vários núcleos, o núcleo c fica na linha nucleos - 1 - c)
+    def linha_tarefa(tarefa_id):
+        return Numero_linhas - 1 - tarefa_id
 
-    tempos_liberacao = {t.nome: [] for t in tarefas}
-    instancias_map = {}
-    for instancia in instancias:
-        tempos_liberacao[instancia['nome_tarefa']].append(instancia['tempo_liberacao'])
-        instancias_map[(instancia['nome_tarefa'], instancia['execucao_id'])] = instancia
+    linhas_cpu = [nucleos - 1 - c for c in range(nucleos)]
 
     U = None
     limite = None
     escalonavel = True
-    # Cálculo da taxa de utilização U = sum(Ci/Ti)
-    U = sum(t.tempo_computacao / t.periodo for t in tarefas)
+    # Cálculo da taxa de utilização U = sum(Ci/Ti): exata para os vereditos
+    # (em float, U = 1 pode virar 1.0000000000000002), float só para exibir
+    utilizacao = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    U = float(utilizacao)
     n = len(tarefas)
     limite = n * (2**(1/n) - 1)
 
     fig = plt.Figure(figsize=(12, 8))
 
+    # Liberações, contagem regressiva, barras e marcadores são desenhados pela
+    # VisaoEscalonamento conforme a janela visível; aqui só a moldura dos eixos
     is_rm = (tipo_analise.lower() == 'rm')
+    ax2 = None
     if tipo_analise.lower() != 'rm':
         # Subplots com sharex para sincronizar zoom/pan
         ax2 = fig.add_subplot(2, 1, 1)
@@ -48,23 +283,7 @@ def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf"):
         ax2.set_yticks(range(len(nomes_tarefas)))
         ax2.set_yticklabels(nomes_tarefas)
         ax2.set_xlabel("Tempo (ms)")
-        ax2.set_xticks(range(0, hiper_periodo + 1))
         ax2.grid(True, axis='x', linestyle=':', alpha=0.7)
-
-        # Marcar liberações no subplot superior
-        for i, nome in enumerate(nomes_tarefas):
-            if nome != "CPU":
-                for tempo in tempos_liberacao.get(nome, []):
-                    ax2.plot(tempo, i, marker='>', color='black')
-
-        # Contagem regressiva de deadlines no subplot superior
-        for i, nome in enumerate(nomes_tarefas):
-            if nome != "CPU":
-                t_inst = [j for j in instancias if j['nome_tarefa'] == nome]
-                for instancia in t_inst:
-                    for tempo in range(instancia['tempo_liberacao'], instancia['deadline_absoluto']):
-                        restante = instancia['deadline_absoluto'] - tempo
-                        ax2.text(tempo + 0.5, i, str(restante), ha='center', va='center', fontsize=7)
     else:
         # Apenas um subplot se for RM
         ax4 = fig.add_subplot(1, 1,1)
@@ -73,6 +292,8 @@ def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf"):
         titulo_gantt = "Escalonamento EDF (Gantt Chart)"
     elif tipo_analise.lower() == "dm":
         titulo_gantt = "Escalonamento DM (Gantt Chart)"
+    elif tipo_analise.lower() == "opa":
+        titulo_gantt = "Escalonamento OPA (Gantt Chart)"
     else:
         titulo_gantt = "Escalonamento RM (Gantt Chart)"
 
@@ -82,107 +303,43 @@ def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf"):
     ax4.set_yticks(range(len(nomes_tarefas)))
     ax4.set_yticklabels(nomes_tarefas)
     ax4.set_xlabel("Tempo (ms)")
-    ax4.set_xticks(range(0, hiper_periodo + 1))
     ax4.grid(True, axis='x', linestyle=':', alpha=0.7)
 
-    # Marcar liberações no subplot inferior
-    for i, nome in enumerate(nomes_tarefas):
-        if nome != "CPU":
-            for tempo in tempos_liberacao.get(nome, []):
-                ax4.plot(tempo, i, marker='>', color='black')
-
-    cores = {}
     cmap = cm.get_cmap("tab10")
-    for i, nome in enumerate(nomes_tarefas):
-        cores[nome] = cmap(i)
-
-    cpu_y = nomes_tarefas.index("CPU")
-
-    intervalos_por_instancia = {}
-    for intervalo in intervalos:
-        instancia = intervalo[0]
-        inicio = intervalo[1]
-        fim = intervalo[2]
-        chave = (instancia['nome_tarefa'], instancia['execucao_id'])
-        if chave not in intervalos_por_instancia:
-            intervalos_por_instancia[chave] = []
-        intervalos_por_instancia[chave].append((inicio, fim))
-
-    # Plotar intervalos, prioridades, etc.
-    for intervalo in intervalos:
-        instancia = intervalo[0]
-        inicio = intervalo[1]
-        fim = intervalo[2]
-        nome_tarefa = instancia['nome_tarefa']
-        execucao_id = instancia['execucao_id']
-        prioridade = instancia.get('prioridade', None) 
-
-        # Barra na CPU
-        ax4.barh(cpu_y, fim - inicio, left=inicio, height=0.8, color=cores.get(nome_tarefa, 'gray'), edgecolor='black')
-        ax4.text((inicio + fim) / 2, cpu_y, str(execucao_id), ha='center', va='center', color='white', fontsize=8)
-
-        if nome_tarefa in nomes_tarefas and nome_tarefa != "CPU":
-            y = nomes_tarefas.index(nome_tarefa)
-            ax4.barh(y, fim - inicio, left=inicio, height=0.8, color=cores.get(nome_tarefa, 'gray'), edgecolor='black', alpha=0.7)
-            ax4.text((inicio + fim) / 2, y, str(execucao_id), ha='center', va='center', color='white', fontsize=8)
-
-            if prioridade is not None:
-                prioridade = Numero_tarefas - int(prioridade)
-                ax4.text((inicio + fim) / 2, y + 0.4, f"P{prioridade}", ha='center', va='bottom', color='black', fontsize=8)
-
-    # Preempções, intervalos ociosos entre intervalos da mesma tarefa e hachura entre ativação e primeira execução
-    for chave, lista_int in intervalos_por_instancia.items():
-        lista_int.sort(key=lambda x: x[0])
-        nome_tarefa, execucao_id = chave
-        instancia = instancias_map[chave]
-        deadline = instancia['deadline_absoluto']
-        release_time = instancia['tempo_liberacao']
-
-        y = nomes_tarefas.index(nome_tarefa) if nome_tarefa in nomes_tarefas else None
-
-        if y is not None and len(lista_int) > 0:
-            # Hachurar entre ativação e primeira execução, se houver gap
-            ini_first = lista_int[0][0]
-            if release_time < ini_first:
-                ax4.add_patch(
-                    patches.Rectangle((release_time, y - 0.4),
-                                      ini_first - release_time,
-                                      0.8,
-                                      facecolor='gray',
-                                      alpha=0.3,
-                                      hatch='\\',
-                                      edgecolor='black')
-                )
-
-            # Verificar interrupções
-            for i, (ini, fim) in enumerate(lista_int):
-                if i < len(lista_int) - 1:
-                    # Interrompido
-                    ax4.plot(fim, y, marker='s', markerfacecolor='blue', markeredgecolor='black', ms=8)
-                    ini_next = lista_int[i+1][0]
-
-                    # Área hachurada representando o intervalo ocioso
-                    ax4.add_patch(
-                        patches.Rectangle((fim, y - 0.4),
-                                          ini_next - fim,
-                                          0.8,
-                                          facecolor='y',
-                                          alpha=0.3,
-                                          hatch='/',
-                                          edgecolor='black')
-                    )
-                else:
-                    # Último intervalo: verificar conclusão e deadline
-                    if instancia['tempo_restante'] == 0 and tipo_analise != 'rm':
-                        if fim <= deadline:
-                            ax4.plot(fim, y, marker='$\u2713$', markerfacecolor='green', markeredgecolor='green', ms=8)
-                        else:
-                            ax4.plot(fim, y, marker='X', markerfacecolor='red', markeredgecolor='black', ms=8)
-                            escalonavel=False
-                    else:
-                        if fim > deadline and tipo_analise != 'rm':
-                            ax4.plot(fim, y, marker='X', markerfacecolor='red', markeredgecolor='black', ms=8)
-                            escalonavel=False
+    cores = [cmap(i) for i in range(len(nomes_tarefas))]
+
+    if metricas is None:
+        metricas = metricas_instancias(instancias, intervalos, hiper_periodo)
+
+    # Preempções, intervalos ociosos entre intervalos da mesma tarefa e hachura entre ativação e primeira execução,
+    # tirados das métricas por instância (uma passada pelos intervalos em metricas_instancias).
+    # Os retângulos são guardados como (x, largura, y) e os marcadores como (x, y) por tipo.
+    linha = linha_tarefa(metricas['tarefa_id'])
+    liberacao = metricas['liberacao']
+    inicio = metricas['inicio']
+    fim = metricas['fim']
+
+    # Hachurar entre ativação e primeira execução, se houver gap
+    com_espera = liberacao < inicio
+    espera = np.column_stack((liberacao[com_espera], (inicio - liberacao)[com_espera], linha[com_espera]))
+
+    # Interrompido: marcador no fim do trecho e área hachurada até a retomada
+    k, parada, retomada = metricas['lacunas']
+    interrompido = np.column_stack((parada, retomada - parada, linha[k]))
+    marcas = {'interrompido': (parada, linha[k]), 'cumprido': ([], []), 'perdido': ([], [])}
+
+    # Último intervalo: verificar conclusão e deadline
+    if tipo_analise != 'rm':
+        cumprido = metricas['concluida'] & (fim <= metricas['deadline'])
+        perdido = fim > metricas['deadline']
+        marcas['cumprido'] = (fim[cumprido], linha[cumprido])
+        marcas['perdido'] = (fim[perdido], linha[perdido])
+        if perdido.any():
+            escalonavel = False
+
+    visao = VisaoEscalonamento(ax4, ax2, intervalos, instancias, espera, interrompido, marcas,
+                               linha_tarefa, cores, linhas_cpu, Numero_tarefas)
+    visao.atualizar()
 
     # Criar patches para a legenda
     patch_hachura = patches.Rectangle((0, 0), 1, 1, facecolor='gray', alpha=0.3, hatch='\\', edgecolor='black')
@@ -192,15 +349,73 @@ def plotar_simulacao(tarefas, linha_do_tempo, instancias, tipo_analise="edf"):
                ['Intervalo ocioso', 'Intervalo Interrompido'],
                loc='lower right', fontsize=9)
 
+    # Resultado da análise de tempo de resposta (DM/RM), se fornecido
+    texto_rta = ""
+    if analise is not None:
+        for a in analise:
+            sinal = "≤" if a['escalonavel'] else ">"
+            texto_rta += f"{a['nome']}: R = {a['tempo_resposta']} {sinal} D = {a['deadline']}\n"
+
+    # Multiprocessador: o veredito vem das perdas na simulação de um hiperperíodo
+    if nucleos > 1:
+        texto_rta += f"Núcleos: {nucleos}\n"
+        if particao is not None:
+            for c, ids in enumerate(particao):
+                texto_rta += f"CPU {c + 1}: {', '.join(tarefas[i].nome for i in ids) or '-'}\n"
+            alocadas = {i for ids in particao for i in ids}
+            if len(alocadas) < len(tarefas):
+                texto_rta += f"Sem núcleo: {', '.join(t.nome for i, t in enumerate(tarefas) if i not in alocadas)}\n"
+                escalonavel = False
+        if utilizacao > nucleos or metricas['perdida'].any():
+            escalonavel = False
+        sem_nucleo = tarefas_sem_nucleo(tarefas)
+        if necessarios is not None:
+            texto_rta += f"Núcleos necessários: {necessarios}\n"
+        elif sem_nucleo:
+            texto_rta += f"Núcleos necessários: nenhum basta (C > min(D, T) em {', '.join(t.nome for t in sem_nucleo)})\n"
+        else:
+            texto_rta += f"Núcleos necessários: > {len(tarefas)}\n"
+
+    # Horizonte de verificação: o veredito vem das perdas dentro dele
+    if horizonte is not None:
+        texto_rta += f"Horizonte: {horizonte['horizonte']} ms ({horizonte['criterio']})\n"
+        if utilizacao > 1 or metricas['perdida'].any():
+            escalonavel = False
+
+    # Resultado do teste de demanda do processador (EDF), se fornecido
+    if qpa is not None:
+        if qpa['escalonavel']:
+            texto_rta += f"QPA: h(t) ≤ t até L = {qpa['limite']} ({qpa['passos']} passos)\n"
+        elif qpa['intervalo_falha'] is None:
+            texto_rta += "QPA: U > 1\n"
+        else:
+            texto_rta += f"QPA: h({qpa['intervalo_falha']}) = {qpa['demanda']} > {qpa['intervalo_falha']}\n"
+
+    if verificacao is not None:
+        texto_rta += (f"Decidido por: {verificacao['teste']} ({verificacao['nivel']}, "
+                      f"{verificacao['tempo_s'] * 1000:.2f} ms)\n")
+
     # Se for RM, mostrar resultados U, limite e se é escalonável
-    if is_rm and U is not None and limite is not None:
-        escalonavel = U <= limite
-        texto_escalonabilidade = f"Escalonabilidade RM:\nU = {U:.3f}, Limite = {limite:.3f}\n"
+    if is_rm and nucleos == 1 and U is not None and limite is not None:
+        # Liu & Layland é só suficiente; com a RTA o veredito é exato
+        if verificacao is not None:
+            escalonavel = verificacao['escalonavel']
+        elif analise is not None:
+            escalonavel = all(a['escalonavel'] for a in analise)
+        else:
+            escalonavel = U <= limite
+        texto_escalonabilidade = f"Escalonabilidade RM:\nU = {U:.3f}, Limite = {limite:.3f}\n" + texto_rta
         texto_escalonabilidade += "Escalonável" if escalonavel else "Não escalonável"
         color =  "black" if escalonavel else "red"
         fig.text(0.9, 0.9, texto_escalonabilidade, ha='center', va='top', fontsize=12, color='white', bbox=dict(facecolor=color, alpha=0.5))
     else:
-        texto_escalonabilidade = f"Escalonabilidade {tipo_analise}:\nU = {U:.3f}\n"
+        if analise is not None:
+            escalonavel = escalonavel and all(a['escalonavel'] for a in analise)
+        if qpa is not None:
+            escalonavel = escalonavel and qpa['escalonavel']
+        if verificacao is not None:
+            escalonavel = escalonavel and verificacao['escalonavel']
+        texto_escalonabilidade = f"Escalonabilidade {tipo_analise}:\nU = {U:.3f}\n" + texto_rta
         texto_escalonabilidade += "Escalonável" if escalonavel else "Não escalonável"
         color =  "black" if escalonavel else "red"
         fig.text(0.9, 0.9, texto_escalonabilidade, ha='center', va='top', fontsize=12, color='white', bbox=dict(facecolor=color, alpha=0.5))
@@ -0,0 +1,574 @@
+# Análise de sensibilidade sobre o modelo Tarefa: quanto um conjunto ainda
+# aguenta, se passa, ou quanto precisa encolher, se falha (EDF, DM e RM).
+# - fator crítico: maior fator que multiplica todos os C mantendo o conjunto
+#   escalonável (breakdown); U * fator é a utilização de breakdown;
+# - C máximo de cada tarefa, com as demais fixas (folga = C máximo - C;
+#   negativa quando o conjunto falha e a tarefa precisa encolher);
+# - período mínimo de cada tarefa, com as demais fixas. Com D = T o deadline
+#   acompanha o período; com D < T o deadline fica e o período não desce
+#   abaixo dele. Se o conjunto falha, o mínimo pode ficar acima do atual.
+# Tudo sobre os testes exatos de analise.py, nas versões em arrays de lá
+# (DemandaEDF para o QPA no EDF, NiveisPrioridade para a RTA no DM/RM): só a
+# tarefa i muda entre um passo e outro. No EDF com D >= T, U <= 1 já dá a
+# resposta; com D < T, o fator sai de uma descida só do QPA a partir do
+# teto, que baixa o valor a cada ponto em que h(t) > t. O C máximo no EDF
+# com D < T não passa pelo QPA: perto de U = 1 o La passa de 1e9 e a
+# confirmação exata custaria segundos por tarefa. Sai de uma faixa entre um
+# teste suficiente e um necessário sobre os deadlines até um horizonte H,
+# de todas as tarefas de uma vez (faixas_c_maximo_edf): o valor dado é
+# escalonável, e 'resolucao_c' diz quanto o exato pode estar acima. Em
+# prioridade fixa, busca binária em que só as tarefas da mesma prioridade ou
+# abaixo da que muda são refeitas, uma de cada vez, partindo dos tempos de
+# resposta do conjunto original.
+# As tarefas e o fator crítico são analisados em paralelo num pool de processos.
+#
+# Uso: python sensibilidade.py conjuntos.json -a edf,dm,rm -p 8 -o sensibilidade.jsonl
+import argparse
+import bisect
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+import numpy as np
+
+from tarefas import Tarefa
+from escalonadores import atribuir_prioridades_dm, atribuir_prioridades_rm
+from analise import teste_qpa_edf, analise_tempo_resposta, NiveisPrioridade, DemandaEDF, soma_exata
+
+# Resolução do fator crítico: o fator é procurado em múltiplos de 1/PRECISAO_FATOR
+PRECISAO_FATOR = 1000
+# Deadlines absolutos (aproximado, por cima) até onde o horizonte H do C máximo
+# no EDF ainda dobra: a faixa de cada C máximo estreita com 1/H
+PONTOS_FAIXA = 250000
+# Quantas vezes o período é dobrado, no máximo, atrás de um período viável
+DOBRAS_PERIODO = 20
+
+def maior_viavel(viavel, lo, hi):
+    # Maior x em [lo, hi] com viavel(x), para viavel verdadeira até um ponto e
+    # falsa dali em diante; None se nenhum serve
+    achado = None
+    while lo <= hi:
+        meio = (lo + hi) // 2
+        if viavel(meio):
+            achado, lo = meio, meio + 1
+        else:
+            hi = meio - 1
+    return achado
+
+def menor_viavel(viavel, lo, hi):
+    # Menor x em [lo, hi] com viavel(x), para viavel falsa até um ponto e
+    # verdadeira dali em diante; None se nenhum serve
+    achado = None
+    while lo <= hi:
+        meio = (lo + hi) // 2
+        if viavel(meio):
+            achado, hi = meio, meio - 1
+        else:
+            lo = meio + 1
+    return achado
+
+def atribuir_prioridades(tarefas, tipo_analise):
+    if tipo_analise == "dm":
+        atribuir_prioridades_dm(tarefas)
+    elif tipo_analise == "rm":
+        atribuir_prioridades_rm(tarefas)
+    else:
+        for t in tarefas:
+            t.prioridade = None
+
+def escalonavel(tarefas, tipo_analise):
+    if tipo_analise == "edf":
+        return teste_qpa_edf(tarefas)['escalonavel']
+    return all(a['escalonavel'] for a in analise_tempo_resposta(tarefas))
+
+def cabe_nivel(niveis, j, respostas=None):
+    # niveis.cabe partindo do tempo de resposta original. 'respostas' (id ->
+    # tempo de resposta no conjunto original) só vale para conjuntos mais
+    # pesados que o original: a iteração parte de min(R, T), que não passa do w
+    # da primeira instância (se R veio de uma instância q > 0, o w dela já
+    # passava de T).
+    inicio = 0
+    if respostas is not None:
+        inicio = min(respostas[id(niveis.ordenadas[j])], int(niveis.periodos[j]))
+    return niveis.cabe(j, inicio)
+
+def passa_qpa(demanda):
+    # Veredito do QPA sobre uma DemandaEDF já ajustada
+    return demanda.utilizacao() <= 1 and demanda.procurar(demanda.limite()) is None
+
+def faixas_c_maximo_edf(tarefas, indices):
+    # Faixa (c, limite) do C máximo no EDF de cada tarefa em 'indices', com as
+    # demais fixas e sem QPA; (None, None) se nem C = 0 serve. Todas de uma vez,
+    # sobre os deadlines até um horizonte H de pelo menos 2 * D máximo:
+    # - cada deadline t <= H com n instâncias de i exige C <= (t - demanda das
+    #   outras em t) / n: o menor desses é 'limite' (teste necessário);
+    # - acima de H, h(t) <= U t + S (S = Σ (T - D) U) fica <= t se La <= H:
+    #   o maior C até 'limite' com La <= H é 'c' (teste suficiente).
+    # c é escalonável e o C máximo exato está em [c, limite]; com La(limite)
+    # <= H a faixa fecha e c é exato. c None com limite: nem La(0) <= H.
+    demanda = DemandaEDF(tarefas)
+    d_max = int(demanda.deadlines.max())
+
+    def pontos(horizonte):
+        return int(np.sum(horizonte // demanda.periodos)) + len(tarefas)
+    horizonte = 2 * d_max
+    if pontos(horizonte) > PONTOS_FAIXA:
+        # Deadlines demais até 2 * D máximo: só o teste necessário, num horizonte
+        # menor, e quem chama confirma com o QPA
+        while horizonte > 1 and pontos(horizonte) > PONTOS_FAIXA:
+            horizonte //= 2
+    else:
+        while pontos(2 * horizonte) <= PONTOS_FAIXA:
+            horizonte *= 2
+    instantes, demandas = demanda.demandas_ate(horizonte)
+    folgas = instantes - demandas
+    limites = []
+    for i in indices:
+        # Entre dois deadlines de i, n fica constante: basta a menor folga t - h(t)
+        # de cada trecho, com C <= C atual + folga / n
+        p, d, c = int(demanda.periodos[i]), int(demanda.deadlines[i]), int(demanda.custos[i])
+        inicios = np.searchsorted(instantes, np.arange(d, horizonte + 1, p))
+        primeiro = inicios[0] if len(inicios) else len(instantes)
+        if primeiro > 0 and folgas[:primeiro].min() < 0:
+            # Antes do primeiro deadline de i as outras já falham sozinhas
+            limites.append(-1)
+        elif not len(inicios):
+            limites.append(d)
+        else:
+            menores = np.minimum.reduceat(folgas, inicios)
+            limites.append(int((menores // np.arange(1, len(inicios) + 1)).min()) + c)
+
+    U = soma_exata((t.tempo_computacao, t.periodo) for t in tarefas)
+    S = soma_exata(((t.periodo - t.deadline) * t.tempo_computacao, t.periodo) for t in tarefas)
+    faixas = []
+    for i, limite in zip(indices, limites):
+        t = tarefas[i]
+        u = Fraction(t.tempo_computacao, t.periodo)
+        outras, soma_outras = U - u, S - (t.periodo - t.deadline) * u
+        limite = min(int(limite), t.deadline, math.floor((1 - outras) * t.periodo))
+        if limite < 0:
+            faixas.append((None, None))
+            continue
+        # La(C) <= H: S das outras + (T - D) C / T <= H (1 - U das outras - C / T)
+        c = min(limite, math.floor((horizonte * (1 - outras) - soma_outras) * t.periodo
+                                   / (t.periodo - t.deadline + horizonte)))
+        faixas.append((c if c >= 0 and horizonte >= d_max else None, limite))
+    return faixas
+
+def faixa_c_maximo(tarefas, i, tipo_analise="edf", respostas=None, faixa=None):
+    # (c, limite) com o C máximo exato em [c, limite]: no EDF com algum D < T,
+    # a faixa de faixas_c_maximo_edf ('faixa', se já calculada); nos demais
+    # casos c_maximo, exato (limite = c).
+    if tipo_analise != "edf" or all(x.deadline >= x.periodo for x in tarefas):
+        c = c_maximo(tarefas, i, tipo_analise, respostas)
+        return c, c
+    if faixa is None:
+        faixa = faixas_c_maximo_edf(tarefas, [i])[0]
+    c, limite = faixa
+    if c is not None or limite is None:
+        return faixa
+    # Nem C = 0 cabe em La <= H (as outras sozinhas já estão perto de U = 1):
+    # busca binária com o QPA até 'limite', em que cada falha também baixa o
+    # teto: com n instâncias de i até o t em que h(t) > t, C <= (t - demanda
+    # das outras em t) / n
+    t = tarefas[i]
+    demanda = DemandaEDF(tarefas, variavel=i)
+    lo, hi = 0, limite
+    while lo <= hi:
+        meio = (lo + hi) // 2
+        demanda.custos[i] = meio
+        instante = demanda.procurar(demanda.limite())
+        if instante is None:
+            c, lo = meio, meio + 1
+            continue
+        n = max(0, (instante - t.deadline) // t.periodo + 1)
+        if n == 0:
+            # A falha nem conta com i
+            return None, None
+        hi = min(meio - 1, (instante - (demanda.demanda(instante) - n * meio)) // n)
+    return c, c
+
+def fator_critico(tarefas, tipo_analise="edf"):
+    # Maior fator k/PRECISAO_FATOR para os C. Multiplicar C por k/P equivale a
+    # multiplicar T e D por P e C por k: os testes seguem em inteiros.
+    # O teto vem de U <= 1 e de C <= D.
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    if U == 0:
+        return None
+    teto = math.floor(PRECISAO_FATOR / U)
+    teto = min([teto] + [t.deadline * PRECISAO_FATOR // t.tempo_computacao for t in tarefas if t.tempo_computacao])
+    # EDF com D >= T: U <= 1 é exato, o teto já é a resposta
+    if tipo_analise == "edf" and all(t.deadline >= t.periodo for t in tarefas):
+        return Fraction(teto, PRECISAO_FATOR)
+
+    def escaladas(k):
+        copias = []
+        for t in tarefas:
+            copia = Tarefa(t.nome, t.periodo * PRECISAO_FATOR, t.deadline * PRECISAO_FATOR, t.tempo_computacao * k)
+            copia.prioridade = t.prioridade
+            copias.append(copia)
+        return copias
+
+    if tipo_analise == "edf":
+        # Uma descida só do QPA, a partir do teto: onde h(t) > t, o fator baixa
+        # para k <= t * k / h(t) (a demanda cresce linear com k) e a descida
+        # segue do mesmo t. Acima dele tudo já passou com um k maior, e com
+        # menos demanda e um La menor continua passando.
+        demanda = DemandaEDF(escaladas(1))
+        unitarios = demanda.custos.copy()
+        k = teto
+        demanda.custos = unitarios * k
+        instante = demanda.deadline_antes(demanda.limite() + 1)
+        while True:
+            instante, _ = demanda.percorrer(instante)
+            if instante is None:
+                return Fraction(k, PRECISAO_FATOR)
+            k = min(k - 1, instante * k // demanda.demanda(instante))
+            if k <= 0:
+                return Fraction(0)
+            demanda.custos = unitarios * k
+
+    def viavel(k):
+        # De baixo para cima: as de prioridade mais baixa são as que costumam falhar
+        niveis = NiveisPrioridade(escaladas(k))
+        return all(niveis.cabe(j) for j in reversed(range(len(tarefas))))
+
+    k = maior_viavel(viavel, 0, teto)
+    return None if k is None else Fraction(k, PRECISAO_FATOR)
+
+def respostas_originais(tarefas):
+    # id -> tempo de resposta de cada tarefa no conjunto como está (prioridade fixa)
+    niveis = NiveisPrioridade(tarefas)
+    return {id(x): niveis.tempo_resposta(j) for j, x in enumerate(niveis.ordenadas)}
+
+def c_maximo(tarefas, i, tipo_analise="edf", respostas=None):
+    # Maior C da tarefa i com as demais fixas (None se nem C = 0 serve); no
+    # EDF com algum D < T, o maior garantido pela faixa de faixa_c_maximo.
+    # As prioridades já devem estar atribuídas (DM/RM não dependem de C).
+    # 'respostas': as de respostas_originais, se já calculadas.
+    t = tarefas[i]
+    original = t.tempo_computacao
+    outras = soma_exata((x.tempo_computacao, x.periodo) for k, x in enumerate(tarefas) if k != i)
+    teto = min(t.deadline, math.floor((1 - outras) * t.periodo))
+    if tipo_analise == "edf":
+        # Com D >= T em todas, U <= 1 é exato: o teto é a resposta
+        if all(x.deadline >= x.periodo for x in tarefas):
+            return teto if teto >= 0 else None
+        # Com D < T, o c de faixa_c_maximo: escalonável, e exato se a faixa fecha
+        return faixa_c_maximo(tarefas, i)[0]
+
+    # Prioridade fixa: tarefas acima de i não mudam; para cada uma de i para
+    # baixo, o maior C de i que ela tolera, a partir do limite das anteriores.
+    # De baixo para cima: as de prioridade mais baixa costumam dar o limite,
+    # e as outras passam a custar um teste só.
+    niveis = NiveisPrioridade(tarefas)
+    nivel = niveis.ordenadas.index(t)
+    if respostas is None:
+        respostas = respostas_originais(tarefas)
+    if any(respostas[id(x)] > x.deadline for x in niveis.ordenadas[:nivel]):
+        return None
+    for j in reversed(range(nivel, len(niveis.ordenadas))):
+        def viavel(c):
+            niveis.custos[nivel] = c
+            return cabe_nivel(niveis, j, respostas if c >= original else None)
+        # Se a tarefa j cabia no original, o C original é piso da busca
+        if teto >= 0 and viavel(teto):
+            continue
+        x = niveis.ordenadas[j]
+        if original < teto and respostas[id(x)] <= x.deadline:
+            teto = maior_viavel(viavel, original + 1, teto - 1) or original
+        else:
+            teto = maior_viavel(viavel, 0, teto - 1)
+            if teto is None:
+                return None
+    return teto
+
+def periodo_minimo(tarefas, i, tipo_analise="edf", respostas=None):
+    # Menor período da tarefa i com as demais fixas (None se nenhum serve).
+    # Com D = T o deadline acompanha o período; com D < T o deadline fica e o
+    # período não desce abaixo dele. Piso também de U <= 1.
+    t = tarefas[i]
+    original, deadline_original = t.periodo, t.deadline
+    acompanha = t.deadline == t.periodo
+    outras = soma_exata((x.tempo_computacao, x.periodo) for k, x in enumerate(tarefas) if k != i)
+    # Se as demais já falham sozinhas, nenhum período de i resolve, qualquer que
+    # seja o C dela; com C = 0, i não interfere e o piso já serve
+    if outras > 1 or (outras == 1 and t.tempo_computacao > 0):
+        return None
+    piso = max(1, t.tempo_computacao)
+    if t.deadline < t.periodo:
+        piso = max(piso, t.deadline)
+    if outras < 1:
+        piso = max(piso, math.ceil(t.tempo_computacao / (1 - outras)))
+
+    if tipo_analise == "edf":
+        # Com D >= T em todas (também em i, no piso), U <= 1 é exato
+        demais_sem_restricao = all(x.deadline >= x.periodo for k, x in enumerate(tarefas) if k != i)
+        if demais_sem_restricao and (t.tempo_computacao == 0 or acompanha or piso <= t.deadline):
+            return piso
+        demanda = DemandaEDF(tarefas, variavel=i)
+        if not demais_sem_restricao:
+            # As demais sozinhas: com C = 0, i não pesa na demanda
+            demanda.custos[i] = 0
+            if not passa_qpa(demanda):
+                return None
+            if t.tempo_computacao == 0:
+                return piso
+            demanda.custos[i] = t.tempo_computacao
+        # A demanda só cai com o período: procura acima do piso, dobrando o teto
+
+        def viavel(periodo):
+            demanda.periodos[i] = periodo
+            if acompanha:
+                demanda.deadlines[i] = periodo
+            return passa_qpa(demanda)
+        piso_busca, teto = piso, max(piso, original)
+        for _ in range(DOBRAS_PERIODO + 1):
+            if viavel(teto):
+                return menor_viavel(viavel, piso_busca, teto)
+            piso_busca, teto = teto + 1, teto * 2
+        return None
+
+    # Prioridade fixa. Baixar o período de i só piora as tarefas abaixo dela
+    # (no RM, e no DM com D = T, as que i ultrapassa na ordem também passam
+    # a sentir i): "as de baixo cabem" vale de um período em diante. As de
+    # cima não sentem i e só diminuem com o período. Já i, com a ordem fixa,
+    # só melhora com períodos maiores; a ordem muda só nos períodos (ou
+    # deadlines) das demais. Então: acha onde as de baixo passam a caber e,
+    # dali para cima, percorre os trechos de ordem fixa até o primeiro em
+    # que i cabe.
+    reordena = tipo_analise == "rm" or (tipo_analise == "dm" and acompanha)
+    if respostas is None:
+        respostas = respostas_originais(tarefas)
+    restantes = NiveisPrioridade([x for x in tarefas if x is not t])
+    acima_original = set()
+    for x in sorted(tarefas, key=lambda x: x.prioridade):
+        if x is t:
+            break
+        acima_original.add(id(x))
+    sem_i = {}
+
+    def cabe_sem_i(x):
+        # As de cima de i no original já foram analisadas sem i
+        if id(x) in acima_original:
+            return respostas[id(x)] <= x.deadline
+        if id(x) not in sem_i:
+            sem_i[id(x)] = cabe_nivel(restantes, restantes.ordenadas.index(x))
+        return sem_i[id(x)]
+
+    # As demais precisam caber sem i: com i elas só ganham interferência
+    if not all(cabe_sem_i(x) for x in restantes.ordenadas):
+        return None
+    if t.tempo_computacao == 0:
+        return piso
+
+    fixos = NiveisPrioridade(tarefas)
+    nivel_fixo = fixos.ordenadas.index(t)
+    # Chave de ordem das demais (período no RM, deadline no DM), com o empate
+    # resolvido pela posição em 'tarefas', como em atribuir_prioridades_rm/dm
+    chave = (lambda x: x.periodo) if tipo_analise == "rm" else (lambda x: x.deadline)
+    chaves_ordem = [(chave(x), tarefas.index(x)) for x in restantes.ordenadas]
+
+    def posicao(periodo):
+        # Muda o período de i e devolve o nível dela
+        t.periodo = periodo
+        if acompanha:
+            t.deadline = periodo
+        if not reordena:
+            return nivel_fixo
+        return bisect.bisect_left(chaves_ordem, (chave(t), i))
+
+    # Várias tarefas seguidas são testadas no mesmo período de i
+    montados = {}
+
+    def niveis_em(nivel):
+        if not reordena:
+            fixos.periodos[nivel_fixo] = t.periodo
+            return fixos
+        if (nivel, t.periodo) not in montados:
+            montados[(nivel, t.periodo)] = restantes.com(nivel, t)
+        return montados[(nivel, t.periodo)]
+
+    def ordem(periodo):
+        nivel = posicao(periodo)
+        return niveis_em(nivel), nivel
+
+    def i_cabe(periodo):
+        niveis, nivel = ordem(periodo)
+        return niveis.cabe(nivel)
+
+    def menor_abaixo(teto):
+        # Cada uma das demais cabe de um período de i em diante (acima de i ela
+        # não sente i; abaixo, sente menos quanto maior o período): o menor
+        # período em que todas cabem, uma por vez a partir do limite das
+        # anteriores, de baixo para cima como em c_maximo
+        menor = piso
+        for k in reversed(range(len(restantes.ordenadas))):
+            def cabe(periodo):
+                # A k-ésima das demais fica no nível k se está acima de i, ou k + 1
+                nivel = posicao(periodo)
+                return k < nivel or cabe_nivel(niveis_em(nivel), k + 1, respostas if periodo <= original else None)
+            if not cabe(menor):
+                menor = menor_viavel(cabe, menor + 1, teto)
+                if menor is None:
+                    return None
+        return menor
+
+    try:
+        # Com período acima de todos os deadlines (e, no RM, de todos os períodos),
+        # i interfere no máximo uma vez em cada uma das de baixo
+        teto = max([piso, original] + [x.deadline for x in tarefas] + [x.periodo + 1 for x in restantes.ordenadas])
+        # Com algum D > T, um período ocupado pode passar de todos os deadlines: o teto dobra
+        dobras = DOBRAS_PERIODO if any(x.deadline > x.periodo for x in tarefas) else 0
+        for _ in range(dobras + 1):
+            menor = menor_abaixo(teto)
+            if menor is not None:
+                break
+            teto *= 2
+        else:
+            return None
+
+        # Trechos de ordem fixa a partir de 'menor': no período igual à chave
+        # de outra tarefa a ordem empata, então a chave é um trecho sozinho
+        if not reordena:
+            chaves = []
+        elif tipo_analise == "rm":
+            chaves = sorted({x.periodo for x in restantes.ordenadas if x.periodo >= menor})
+        else:
+            chaves = sorted({x.deadline for x in restantes.ordenadas if x.deadline >= menor})
+        lo = menor
+        while True:
+            niveis, nivel = ordem(lo)
+            if not all(cabe_sem_i(x) for x in niveis.ordenadas[:nivel]):
+                return None
+            ultimo = not chaves
+            if ultimo:
+                # Último trecho: com D = T, o deadline de i cresce com o período
+                hi = max(teto, lo)
+                for _ in range(DOBRAS_PERIODO if acompanha else 0):
+                    if i_cabe(hi):
+                        break
+                    hi *= 2
+            elif chaves[0] == lo:
+                hi = chaves.pop(0)
+            else:
+                hi = chaves[0] - 1
+            if i_cabe(hi):
+                return menor_viavel(i_cabe, lo, hi)
+            if ultimo:
+                return None
+            lo = hi + 1
+    finally:
+        t.periodo, t.deadline = original, deadline_original
+
+def sensibilidade_tarefa(trabalho):
+    # Roda em um processo do pool: faixa do C máximo e período mínimo de uma
+    # tarefa. 'respostas' são os tempos de resposta do conjunto original, na
+    # ordem das tarefas (None no EDF), e 'faixa' a de faixas_c_maximo_edf (ou
+    # None), calculados uma vez só para todas.
+    dados, tipo_analise, i, respostas, faixa = trabalho
+    tarefas = [Tarefa(*t) for t in dados]
+    atribuir_prioridades(tarefas, tipo_analise)
+    if respostas is not None:
+        respostas = {id(t): r for t, r in zip(tarefas, respostas)}
+    return (faixa_c_maximo(tarefas, i, tipo_analise, respostas, faixa),
+            periodo_minimo(tarefas, i, tipo_analise, respostas))
+
+def fator_conjunto(trabalho):
+    # Roda em um processo do pool, junto com as tarefas: o fator crítico
+    dados, tipo_analise = trabalho
+    tarefas = [Tarefa(*t) for t in dados]
+    atribuir_prioridades(tarefas, tipo_analise)
+    return fator_critico(tarefas, tipo_analise)
+
+def analisar_sensibilidade(tarefas, tipo_analise="edf", processos=None):
+    # Resultado do conjunto e uma entrada por tarefa (na ordem de 'tarefas').
+    # processos=1 roda tudo neste processo, sem pool.
+    inicio = time.perf_counter()
+    tipo_analise = tipo_analise.lower()
+    tarefas = [Tarefa(t.nome, t.periodo, t.deadline, t.tempo_computacao) for t in tarefas]
+    atribuir_prioridades(tarefas, tipo_analise)
+    dados = [(t.nome, t.periodo, t.deadline, t.tempo_computacao) for t in tarefas]
+    respostas = None
+    if tipo_analise != "edf":
+        por_id = respostas_originais(tarefas)
+        respostas = [por_id[id(t)] for t in tarefas]
+    faixas = [None] * len(tarefas)
+    if tipo_analise == "edf" and any(t.deadline < t.periodo for t in tarefas):
+        faixas = faixas_c_maximo_edf(tarefas, list(range(len(tarefas))))
+    trabalhos = [(dados, tipo_analise, i, respostas, faixas[i]) for i in range(len(tarefas))]
+    if processos == 1:
+        fator = fator_conjunto((dados, tipo_analise))
+        por_tarefa = list(map(sensibilidade_tarefa, trabalhos))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            # O fator entra na fila antes das tarefas e roda junto com elas
+            fator = pool.submit(fator_conjunto, (dados, tipo_analise))
+            por_tarefa = list(pool.map(sensibilidade_tarefa, trabalhos))
+            fator = fator.result()
+
+    U = sum(Fraction(t.tempo_computacao, t.periodo) for t in tarefas)
+    if respostas is None:
+        passou = escalonavel(tarefas, tipo_analise)
+    else:
+        passou = all(r <= t.deadline for t, r in zip(tarefas, respostas))
+    resultado = {
+        'algoritmo': tipo_analise,
+        'escalonavel': passou,
+        'utilizacao': float(U),
+        'fator_critico': None if fator is None else float(fator),
+        'utilizacao_critica': None if fator is None else float(U * fator),
+        'tarefas': [],
+    }
+    for t, ((c, limite), periodo) in zip(tarefas, por_tarefa):
+        resultado['tarefas'].append({
+            'nome': t.nome,
+            'tempo_computacao': t.tempo_computacao,
+            'c_maximo': c,
+            # O C máximo exato está em [c_maximo, c_maximo + resolucao_c]; 0 = exato
+            'resolucao_c': None if c is None else limite - c,
+            'folga_c': None if c is None else c - t.tempo_computacao,
+            'periodo': t.periodo,
+            'periodo_minimo': periodo,
+        })
+    resultado['tempo_s'] = time.perf_counter() - inicio
+    return resultado
+
+def main(argv=None):
+    from lote import ler_conjuntos, descrever_erro
+
+    parser = argparse.ArgumentParser(description="Sensibilidade: fator crítico, C máximo e período mínimo por tarefa")
+    parser.add_argument("arquivos", nargs="+", help="arquivos .json ou .csv com conjuntos de tarefas (formato do lote.py)")
+    parser.add_argument("-a", "--algoritmos", default="edf,dm,rm", help="lista separada por vírgula (padrão: edf,dm,rm)")
+    parser.add_argument("-p", "--processos", type=int, default=None, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument("-o", "--saida", default="-", help="arquivo JSON Lines de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    algoritmos = [a.strip().lower() for a in args.algoritmos.split(",") if a.strip()]
+    for a in algoritmos:
+        if a not in ("edf", "dm", "rm"):
+            parser.error(f"algoritmo desconhecido: {a}")
+
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    try:
+        for nome, dados, erro in ler_conjuntos(args.arquivos):
+            tarefas = None if erro else [Tarefa(*t) for t in dados]
+            for tipo in algoritmos:
+                # Como no lote.py, um conjunto inválido vira uma linha de erro
+                resultado = {'conjunto': nome, 'algoritmo': tipo, 'erro': erro}
+                if not erro:
+                    try:
+                        resultado = {'conjunto': nome, **analisar_sensibilidade(tarefas, tipo, args.processos)}
+                    except (ValueError, ArithmeticError) as e:
+                        resultado['erro'] = descrever_erro(e)
+                saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                saida.flush()
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+if __name__ == "__main__":
+    main()
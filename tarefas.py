@@ -1,6 +1,9 @@
 import math
+from collections import namedtuple
 
 class Tarefa:
+    __slots__ = ('nome', 'periodo', 'deadline', 'tempo_computacao', 'prioridade')
+
     def __init__(self, nome, periodo, deadline, tempo_computacao):
         self.nome = nome
         self.periodo = periodo
@@ -8,6 +11,32 @@ class Tarefa:
         self.tempo_computacao = tempo_computacao
         self.prioridade = None  # Usado por DM ou RM
 
+# Forma imutável e compacta de uma tarefa (tupla nomeada: sem dict por
+# objeto e hashable). 'id' é a posição da tarefa no conjunto, a mesma usada
+# como 'tarefa_id' nas instâncias.
+TarefaFixa = namedtuple('TarefaFixa', ['id', 'nome', 'periodo', 'deadline', 'tempo_computacao', 'prioridade'])
+
+def congelar_tarefas(tarefas):
+    return tuple(TarefaFixa(i, t.nome, t.periodo, t.deadline, t.tempo_computacao, t.prioridade)
+                 for i, t in enumerate(tarefas))
+
+def mdc_tarefas(tarefas):
+    # Maior divisor comum de todos os períodos, deadlines e tempos de computação
+    return math.gcd(*(x for t in tarefas for x in (t.periodo, t.deadline, t.tempo_computacao))) or 1
+
+def normalizar_tarefas(tarefas):
+    # Cópias das tarefas com os parâmetros divididos pelo MDC (a escala): com
+    # tudo múltiplo de 5 ou 10 ms, cada unidade simulada vale 5 ou 10 ms.
+    # A ordem de liberações, deadlines e términos não muda, então o escalonamento
+    # é o mesmo; escalonadores.desnormalizar volta os resultados para ms.
+    escala = mdc_tarefas(tarefas)
+    normalizadas = []
+    for t in tarefas:
+        copia = Tarefa(t.nome, t.periodo // escala, t.deadline // escala, t.tempo_computacao // escala)
+        copia.prioridade = t.prioridade
+        normalizadas.append(copia)
+    return normalizadas, escala
+
 def calcular_mmc(a, b):
     return abs(a * b) // math.gcd(a, b)
 
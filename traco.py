@@ -0,0 +1,215 @@
+# Traço de escalonamento em disco: formato binário colunar, gravado em fluxo
+# enquanto o escalonador produz os intervalos e lido por mmap sem carregar o
+# arquivo (as colunas de cada bloco são arrays NumPy apontando para o mapa).
+#
+# Layout (inteiros little-endian, tudo alinhado em 8 bytes):
+#   MAGICA (8) | versão u32 | tamanho do cabeçalho u32 | cabeçalho JSON (+ preenchimento)
+#   bloco*: n u64 | menor início i64 | maior fim i64 | colunas
+#           inicio i64[n] | fim i64[n] | restante i64[n] | tarefa i32[n] | execucao i32[n]
+#           | nucleo i32[n] (+ preenchimento)
+#   índice: (posição, n, menor início, maior fim) i64 por bloco
+#   rodapé: posição do índice i64 | número de blocos i64 | MAGICA_FIM (8)
+# Cada segmento é um intervalo (instancia, inicio, fim[, nucleo]); 'restante' é o
+# tempo que faltava à instância ao fim do segmento. Um arquivo sem rodapé
+# (gravação interrompida) ainda é lido percorrendo os blocos completos.
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from tarefas import Tarefa
+from escalonadores import nova_instancia
+
+MAGICA = b"ESCTRACO"
+MAGICA_FIM = b"ESCFIM01"
+VERSAO = 1
+SEGMENTOS_POR_BLOCO = 65536
+
+CABECALHO = struct.Struct("<8sII")
+CABECALHO_BLOCO = struct.Struct("<Qqq")
+RODAPE = struct.Struct("<qq8s")
+COLUNAS = (('inicio', np.int64), ('fim', np.int64), ('restante', np.int64),
+           ('tarefa', np.int32), ('execucao', np.int32), ('nucleo', np.int32))
+
+def alinhar(tamanho):
+    return -(-tamanho // 8) * 8
+
+def tamanho_bloco(n):
+    return CABECALHO_BLOCO.size + sum(alinhar(n * np.dtype(tipo).itemsize) for _, tipo in COLUNAS)
+
+class EscritorTraco:
+    # Uso: with EscritorTraco(caminho, tarefas, algoritmo="edf", tempo_total=H) as traco:
+    #          traco.escrever(intervalos)   # quantas vezes for preciso, em ordem de início
+    # 'info' vai para o cabeçalho junto com as tarefas.
+    def __init__(self, caminho, tarefas, **info):
+        self.arquivo = open(caminho, "wb")
+        cabecalho = {'versao': VERSAO, **info,
+                     'tarefas': [[t.nome, t.periodo, t.deadline, t.tempo_computacao, t.prioridade] for t in tarefas]}
+        texto = json.dumps(cabecalho, ensure_ascii=False).encode("utf-8")
+        self.arquivo.write(CABECALHO.pack(MAGICA, VERSAO, len(texto)))
+        self.arquivo.write(texto.ljust(alinhar(len(texto)), b" "))
+        self.colunas = {nome: [] for nome, _ in COLUNAS}
+        self.indice = []
+        # Tempo já executado das instâncias ainda não concluídas, por (tarefa_id, execucao_id)
+        self.computacao = [t.tempo_computacao for t in tarefas]
+        self.executado = {}
+
+    def escrever(self, intervalos):
+        # 'restante' vem do C da tarefa menos o já executado pela instância:
+        # quando o segmento é gravado, a instância pode ter executado mais depois dele
+        inicio, fim, restante = self.colunas['inicio'], self.colunas['fim'], self.colunas['restante']
+        tarefa, execucao, nucleo = self.colunas['tarefa'], self.colunas['execucao'], self.colunas['nucleo']
+        executado = self.executado
+        for intervalo in intervalos:
+            instancia = intervalo[0]
+            chave = (instancia.tarefa_id, instancia.execucao_id)
+            feito = executado.pop(chave, 0) + intervalo[2] - intervalo[1]
+            falta = self.computacao[instancia.tarefa_id] - feito
+            if falta > 0:
+                executado[chave] = feito
+            inicio.append(intervalo[1])
+            fim.append(intervalo[2])
+            restante.append(falta)
+            tarefa.append(instancia.tarefa_id)
+            execucao.append(instancia.execucao_id)
+            nucleo.append(intervalo[3] if len(intervalo) > 3 else 0)
+            if len(inicio) >= SEGMENTOS_POR_BLOCO:
+                self.descarregar()
+
+    def descarregar(self):
+        n = len(self.colunas['inicio'])
+        if n == 0:
+            return
+        arrays = [np.array(self.colunas[nome], dtype=tipo) for nome, tipo in COLUNAS]
+        self.indice.append((self.arquivo.tell(), n, int(arrays[0].min()), int(arrays[1].max())))
+        self.arquivo.write(CABECALHO_BLOCO.pack(n, self.indice[-1][2], self.indice[-1][3]))
+        for array in arrays:
+            dados = array.tobytes()
+            self.arquivo.write(dados.ljust(alinhar(len(dados)), b"\0"))
+        for lista in self.colunas.values():
+            lista.clear()
+
+    def fechar(self):
+        if self.arquivo.closed:
+            return
+        self.descarregar()
+        posicao = self.arquivo.tell()
+        self.arquivo.write(np.array(self.indice, dtype=np.int64).reshape(-1, 4).tobytes())
+        self.arquivo.write(RODAPE.pack(posicao, len(self.indice), MAGICA_FIM))
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, *erro):
+        if tipo_erro is not None:
+            # Gravação interrompida: descarrega os blocos completos, mas sem
+            # índice nem rodapé, para o leitor ver o arquivo como incompleto
+            if not self.arquivo.closed:
+                self.descarregar()
+                self.arquivo.close()
+            return
+        self.fechar()
+
+class LeitorTraco:
+    # Abre o traço por mmap: só o cabeçalho e o índice são interpretados na
+    # abertura; os segmentos são lidos sob demanda, bloco a bloco.
+    # Os arrays de bloco() apontam para o mapa e valem enquanto o leitor estiver aberto.
+    def __init__(self, caminho):
+        with open(caminho, "rb") as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magica, versao, tamanho = CABECALHO.unpack_from(self.mapa, 0)
+        if magica != MAGICA or versao != VERSAO:
+            self.mapa.close()
+            raise ValueError(f"Arquivo de traço inválido ou de outra versão: {caminho}")
+        self.info = json.loads(self.mapa[CABECALHO.size:CABECALHO.size + tamanho].decode("utf-8"))
+        self.tarefas = []
+        for nome, periodo, deadline, c, prioridade in self.info.pop('tarefas'):
+            tarefa = Tarefa(nome, periodo, deadline, c)
+            tarefa.prioridade = prioridade
+            self.tarefas.append(tarefa)
+        self.indice = self.ler_indice(CABECALHO.size + alinhar(tamanho))
+
+    def ler_indice(self, primeiro_bloco):
+        tamanho = len(self.mapa)
+        if tamanho >= primeiro_bloco + RODAPE.size:
+            posicao, blocos, magica = RODAPE.unpack_from(self.mapa, tamanho - RODAPE.size)
+            if magica == MAGICA_FIM:
+                return np.frombuffer(self.mapa, dtype=np.int64, count=blocos * 4, offset=posicao).reshape(-1, 4)
+        # Sem rodapé: percorre os blocos que chegaram inteiros ao disco
+        indice = []
+        posicao = primeiro_bloco
+        while posicao + CABECALHO_BLOCO.size <= tamanho:
+            n, menor_inicio, maior_fim = CABECALHO_BLOCO.unpack_from(self.mapa, posicao)
+            if n == 0 or posicao + tamanho_bloco(n) > tamanho:
+                break
+            indice.append((posicao, n, menor_inicio, maior_fim))
+            posicao += tamanho_bloco(n)
+        return np.array(indice, dtype=np.int64).reshape(-1, 4)
+
+    def __len__(self):
+        return int(self.indice[:, 1].sum())
+
+    def bloco(self, k):
+        # Colunas do bloco k como arrays NumPy sobre o mapa (sem cópia)
+        posicao, n = int(self.indice[k, 0]), int(self.indice[k, 1])
+        posicao += CABECALHO_BLOCO.size
+        colunas = {}
+        for nome, tipo in COLUNAS:
+            colunas[nome] = np.frombuffer(self.mapa, dtype=tipo, count=n, offset=posicao)
+            posicao += alinhar(n * np.dtype(tipo).itemsize)
+        return colunas
+
+    def segmentos(self, inicio=None, fim=None):
+        # Segmentos que cruzam [inicio, fim), em ordem de gravação. O índice
+        # descarta os blocos fora da janela sem tocar nos dados deles.
+        inicio = -np.inf if inicio is None else inicio
+        fim = np.inf if fim is None else fim
+        partes = {nome: [] for nome, _ in COLUNAS}
+        for k in np.nonzero((self.indice[:, 2] < fim) & (self.indice[:, 3] > inicio))[0]:
+            colunas = self.bloco(k)
+            selecao = (colunas['inicio'] < fim) & (colunas['fim'] > inicio)
+            for nome, _ in COLUNAS:
+                partes[nome].append(colunas[nome][selecao])
+        return {nome: np.concatenate(partes[nome]) if partes[nome] else np.empty(0, dtype=tipo)
+                for nome, tipo in COLUNAS}
+
+    def reconstruir(self, inicio=None, fim=None):
+        # Instâncias e intervalos no formato dos escalonadores, para plotagem e
+        # métricas: todas as instâncias liberadas na janela e as que executam nela.
+        # tempo_restante é o que faltava ao fim do último segmento dentro da janela.
+        colunas = self.segmentos(inicio, fim)
+        instancias = {}
+        for tarefa_id, t in enumerate(self.tarefas):
+            primeira = 0 if inicio is None else max(0, -(-int(inicio) // t.periodo))
+            ultima = self.info.get('tempo_total', 0) if fim is None else fim
+            for k in range(primeira, -(-int(ultima) // t.periodo)):
+                instancias[(tarefa_id, k + 1)] = nova_instancia(tarefa_id, t, k)
+        intervalos = []
+        for ini, fim_segmento, restante, tarefa_id, execucao_id, nucleo in zip(
+                *(colunas[nome].tolist() for nome, _ in COLUNAS)):
+            chave = (tarefa_id, execucao_id)
+            if chave not in instancias:
+                instancias[chave] = nova_instancia(tarefa_id, self.tarefas[tarefa_id], execucao_id - 1)
+            instancia = instancias[chave]
+            instancia.tempo_restante = restante
+            if self.info.get('nucleos', 1) > 1:
+                intervalos.append((instancia, ini, fim_segmento, nucleo))
+            else:
+                intervalos.append((instancia, ini, fim_segmento))
+        return list(instancias.values()), intervalos
+
+    def fechar(self):
+        self.indice = None
+        try:
+            self.mapa.close()
+        except BufferError:
+            # Ainda há arrays de bloco() em uso; o mapa fecha quando eles forem liberados
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()